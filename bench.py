@@ -0,0 +1,687 @@
+"""
+Замеры производительности игры.
+
+Запуск: python bench.py [имя замера ...] [--output файл.json]
+Без имен выполняются все замеры. Результаты печатаются и сохраняются
+в формате JSON (по умолчанию в bench_results/<коммит>.json), чтобы
+сравнивать их между коммитами. Замеры отрисовки и запуска окна требуют
+дисплея; без него их можно запустить под Xvfb: xvfb-run python bench.py.
+Если замер с бюджетом (импорт, запуск, арена, долгий прогон интерфейса)
+его превысил, bench.py завершается с ошибкой.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from snake.body import Snake
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Бюджеты запуска в мс: импорт пакета игры сверх пустого интерпретатора и первый кадр окна
+IMPORT_BUDGET_MS = 150
+FIRST_FRAME_BUDGET_MS = 1000
+# На сколько может вырасти память процесса за долгий прогон интерфейса, МБ
+SOAK_RSS_BUDGET_MB = 5
+
+
+class Skip(Exception):
+    """
+    Замер невозможен в текущем окружении.
+    """
+
+
+class LegacySegment:
+    """
+    Часть тела в старом представлении: отдельный объект на каждую клетку.
+    """
+    def __init__(self, canvas, x, y):
+        self.canvas = canvas
+        self.x = x
+        self.y = y
+        self.body = [self]
+        self.direction = (1, 0)
+
+
+def build_legacy(length, width):
+    body = [LegacySegment(None, 0, 0)]
+    for i in range(1, length):
+        body.insert(0, LegacySegment(None, i % width, i // width))
+    return body
+
+
+def build_snake(length, width, height):
+    snake = Snake(0, 0, width, height)
+    for i in range(1, length):
+        snake.body.push_head(i % width, i // width)
+    return snake
+
+
+def measure(function, *args):
+    """
+    Возвращает результат функции, число выделенных байт и число живых блоков памяти.
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = function(*args)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return result, size, blocks
+
+
+def bench_body_memory(length=1000, width=40, height=40, ticks=1000):
+    """
+    Сравнивает расход памяти на часть тела и выделения памяти за шаг.
+    """
+    legacy, legacy_bytes, _ = measure(build_legacy, length, width)
+    snake, snake_bytes, _ = measure(build_snake, length, width, height)
+
+    def tick_legacy():
+        for i in range(ticks):
+            head = legacy[0]
+            legacy.insert(0, LegacySegment(None, (head.x + 1) % width, head.y))
+            legacy.pop()
+
+    def tick_snake():
+        for i in range(ticks):
+            snake.move(1, 0)
+
+    _, _, legacy_blocks = measure(tick_legacy)
+    _, _, snake_blocks = measure(tick_snake)
+    return {
+        "length": length,
+        "legacy_bytes_per_segment": legacy_bytes / length,
+        "bytes_per_segment": snake_bytes / length,
+        "legacy_allocations_per_tick": legacy_blocks / ticks,
+        "allocations_per_tick": snake_blocks / ticks,
+    }
+
+
+def bench_batch_env(n=4096, width=40, height=40, steps=500):
+    """
+    Считает шаги в секунду для векторной среды на одном ядре.
+    """
+    import numpy as np
+    from snake.batch_env import BatchSnakeEnv
+
+    env = BatchSnakeEnv(n, width, height, seed=0)
+    actions = np.random.default_rng(0).integers(-1, 4, size=(steps, n))
+    start = time.perf_counter()
+    for i in range(steps):
+        env.step(actions[i])
+    elapsed = time.perf_counter() - start
+    return {"envs": n, "steps": steps, "env_steps_per_second": n * steps / elapsed}
+
+
+def bench_rollout(steps_per_worker=100000):
+    """
+    Считает шаги в секунду при сборе траекторий на 1, 2, 4 ... N процессах.
+    """
+    from snake.rollout import collect
+
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    results = {}
+    for workers in counts:
+        steps = steps_per_worker * workers
+        start = time.perf_counter()
+        collect(steps, workers).close()
+        results[workers] = steps / (time.perf_counter() - start)
+    return {"steps_per_second_by_workers": results}
+
+
+def build_engine(length, width, height):
+    """
+    Создает движок со змейкой заданной длины, уложенной змейкой по строкам поля.
+    """
+    from snake.engine import SnakeEngine
+
+    engine = SnakeEngine(width, height, seed=0)
+    body = engine.snake.body
+    body.pop_tail()
+    for i in range(length):
+        y, x = divmod(i, width)
+        body.push_head(x if y % 2 == 0 else width - 1 - x, y)
+    engine.direction = (1, 0) if (length - 1) // width % 2 == 0 else (-1, 0)
+    engine.food = engine.spawn_food()
+    return engine
+
+
+def bench_autopilot(lengths=(10, 100, 1000, 5000), boards=((40, 40), (200, 200)), ticks=300):
+    """
+    Измеряет время решения автопилота в зависимости от длины змейки: среднее, 99-й перцентиль и максимум,
+    и сколько раз за партию поле расстояний строилось заново, а не чинилось.
+
+    На поле ставятся стены, чтобы поле расстояний обходило и их.
+    """
+    from snake.autopilot import Autopilot
+    from snake.server import percentiles
+
+    results = {}
+    for width, height in boards:
+        for length in lengths:
+            if length >= width * height // 2:
+                continue
+            engine = build_engine(length, width, height)
+            engine.update_walls()
+            autopilot = Autopilot(engine)
+            autopilot.choose()
+            times = []
+            while len(times) < ticks:
+                start = time.perf_counter()
+                direction = autopilot.choose()
+                times.append((time.perf_counter() - start) * 1000)
+                if engine.step(direction).done:
+                    break
+            results[f"{width}x{height}/{length}"] = {"mean": sum(times) / len(times),
+                                                     "p99": percentiles(times, (99,))["p99"], "max": max(times),
+                                                     "ticks": len(times), "rebuilds": autopilot.rebuilds}
+    return {"decision_ms": results}
+
+
+def bench_planner(lengths=(10, 100, 500), width=40, height=40, simulations=2000, clones=10000):
+    """
+    Считает симуляции MCTS в секунду, время копирования игры и память таблицы транспозиций.
+    """
+    import random
+
+    from snake.planner import Planner
+
+    rng = random.Random(0)
+    per_second = {}
+    clone_us = {}
+    memory = {}
+    for length in lengths:
+        engine = build_engine(length, width, height)
+        start = time.perf_counter()
+        for _ in range(clones):
+            engine.clone(rng)
+        clone_us[length] = (time.perf_counter() - start) / clones * 1e6
+
+        planner = Planner(engine, seed=0)
+        planner.prepare()
+        start = time.perf_counter()
+        planner.choose(simulations)
+        per_second[length] = simulations / (time.perf_counter() - start)
+
+        # Память считается отдельным прогоном: под tracemalloc симуляции заметно медленнее
+        planner = Planner(engine, seed=0)
+        planner.prepare()
+        _, size, _ = measure(planner.choose, simulations)
+        memory[length] = {"nodes": len(planner.table), "bytes": size,
+                          "bytes_per_node": size / max(len(planner.table), 1)}
+    return {"simulations_per_second": per_second, "clone_us": clone_us, "table_memory": memory}
+
+
+def bench_engine(lengths=(10, 100, 1000, 10000), width=128, height=128, ticks=20000):
+    """
+    Считает шаги движка в секунду в зависимости от длины змейки.
+    """
+    results = {}
+    for length in lengths:
+        engine = build_engine(length, width, height)
+        elapsed = 0.0
+        done = 0
+        while done < ticks:
+            start = time.perf_counter()
+            while done < ticks and not engine.step().done:
+                done += 1
+            elapsed += time.perf_counter() - start
+            if engine.done:
+                done += 1
+                engine = build_engine(length, width, height)
+        results[length] = ticks / elapsed
+    return {"ticks_per_second": results}
+
+
+def bench_rewind(lengths=(10, 100, 1000, 10000), width=128, height=128, rounds=20):
+    """
+    Измеряет стоимость записи и отмены шага в буфере перемотки и его память.
+    """
+    from snake.rewind import CAPACITY, Rewind
+
+    record_us = {}
+    undo_us = {}
+    for length in lengths:
+        engine = build_engine(length, width, height)
+        rewind = Rewind()
+        recorded = undone = 0
+        record_time = undo_time = 0.0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            while len(rewind) < CAPACITY:
+                direction, food, walls, wall_cells = engine.direction, engine.food, engine.walls, engine.wall_cells
+                result = engine.step()
+                if result.done:
+                    engine.retreat(result.tail, direction, food if result.ate else None)
+                    break
+                rewind.record(engine, result, direction, food, walls, wall_cells)
+                recorded += 1
+            record_time += time.perf_counter() - start
+            start = time.perf_counter()
+            while len(rewind):
+                rewind.undo(engine)
+                undone += 1
+            undo_time += time.perf_counter() - start
+        record_us[length] = record_time / max(recorded, 1) * 1e6
+        undo_us[length] = undo_time / max(undone, 1) * 1e6
+    _, size, _ = measure(Rewind)
+    return {"step_and_record_us": record_us, "undo_us": undo_us, "buffer_bytes": size, "capacity_ticks": CAPACITY}
+
+
+def bench_collision(lengths=(10, 100, 1000, 10000), width=128, height=128, repeat=100000):
+    """
+    Измеряет стоимость проверки столкновений с телом и стенами.
+    """
+    results = {}
+    for length in lengths:
+        engine = build_engine(length, width, height)
+        engine.update_walls()
+        check = engine.check_collision
+        start = time.perf_counter()
+        for _ in range(repeat):
+            check()
+        results[length] = (time.perf_counter() - start) / repeat * 1e9
+    return {"check_collision_ns": results}
+
+
+def bench_food(fills=(0.5, 0.9, 0.99), width=128, height=128, repeat=100000):
+    """
+    Измеряет время выбора клетки для еды на заполненном змейкой поле.
+    """
+    results = {}
+    for fill in fills:
+        engine = build_engine(int(width * height * fill), width, height)
+        spawn = engine.spawn_food
+        start = time.perf_counter()
+        for _ in range(repeat):
+            spawn()
+        results[fill] = (time.perf_counter() - start) / repeat * 1e9
+    return {"spawn_food_ns": results}
+
+
+def naive_observation(engine, directions=False):
+    """
+    Строит наблюдение заново по телу, еде и стенам, как это делалось без Observer.
+    """
+    import numpy as np
+    from snake.observation import BODY, DIRECTION_PLANES, FOOD, HEAD, RAY_TARGETS, RAYS, WALLS
+
+    width, height = engine.width, engine.height
+    planes = np.zeros((8 if directions else 4, height, width), dtype=np.uint8)
+    body = list(engine.snake.body)
+    for i, (x, y) in enumerate(body):
+        planes[BODY, y, x] += 1
+        if directions and i > 0:
+            nx, ny = body[i - 1]
+            direction = ((nx - x + 1) % width - 1, (ny - y + 1) % height - 1)
+            planes[DIRECTION_PLANES[direction], y, x] = 1
+    hx, hy = body[0]
+    planes[HEAD, hy, hx] = 1
+    planes[FOOD, engine.food.y, engine.food.x] = 1
+    for wall in engine.walls:
+        planes[WALLS, wall.y, wall.x] = 1
+    rays = np.zeros((len(RAYS), len(RAY_TARGETS)), dtype=np.float32)
+    for r, (dx, dy) in enumerate(RAYS):
+        limit = width - 1 if dy == 0 else height - 1 if dx == 0 else min(width, height) - 1
+        for t, plane in enumerate(RAY_TARGETS):
+            for k in range(1, limit + 1):
+                if planes[plane, (hy + dy * k) % height, (hx + dx * k) % width]:
+                    rays[r, t] = 1 / k
+                    break
+    return planes, rays
+
+
+def bench_observation(lengths=(10, 100, 1000), width=64, height=64, ticks=500):
+    """
+    Сравнивает время наблюдения за шаг: Observer против построения заново.
+    """
+    from snake.observation import Observer
+
+    results = {}
+    for length in lengths:
+        engine = build_engine(length, width, height)
+        observer = Observer(engine)
+        incremental = naive = 0.0
+        steps = 0
+        while steps < ticks:
+            result = engine.step()
+            if result.done:
+                engine = build_engine(length, width, height)
+                observer = Observer(engine)
+                continue
+            start = time.perf_counter()
+            observer.update(result)
+            incremental += time.perf_counter() - start
+            start = time.perf_counter()
+            naive_observation(engine)
+            naive += time.perf_counter() - start
+            steps += 1
+        results[length] = {"observer_us": incremental / ticks * 1e6, "naive_us": naive / ticks * 1e6}
+    return {"observation": results}
+
+
+def bench_snapshot(lengths=(10, 100, 1000), width=64, height=64, count=10000):
+    """
+    Измеряет размер снимков и скорость просмотра файла из count снимков змеек заданной длины.
+    """
+    import tempfile
+
+    from snake import snapshot
+
+    sizes = {}
+    scan_us = {}
+    restore_us = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for length in lengths:
+            engine = build_engine(length, width, height)
+            sizes[length] = len(snapshot.to_bytes(engine))
+            path = os.path.join(directory, f"{length}.bin")
+            snapshot.save_many([engine] * count, path)
+            with snapshot.SnapshotFile(path) as file:
+                start = time.perf_counter()
+                offsets = [offset for offset, header in file.headers() if header.length == length]
+                scan_us[length] = (time.perf_counter() - start) / count * 1e6
+                start = time.perf_counter()
+                for offset in offsets[:1000]:
+                    file.restore(offset)
+                restore_us[length] = (time.perf_counter() - start) / min(len(offsets), 1000) * 1e6
+    return {"snapshot_bytes": sizes, "header_scan_us": scan_us, "restore_us": restore_us}
+
+
+def bench_arena(snakes=100, width=200, height=200, food=100, ticks=500, budget_ms=50):
+    """
+    Измеряет шаг арены с многими змейками под управлением ИИ.
+    """
+    from snake.arena import ArenaEngine, GreedyController
+
+    arena = ArenaEngine(width, height, [GreedyController() for _ in range(snakes)], food=food, respawn=True,
+                        seed=1)
+    times = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        arena.step()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {"snakes": snakes, "board": f"{width}x{height}", "tick_mean_ms": sum(times) / ticks,
+            "tick_p99_ms": times[int(ticks * 0.99) - 1], "tick_max_ms": times[-1],
+            "within_budget": times[-1] <= budget_ms}
+
+
+def bench_server(clients=1000, width=200, height=200, food=100, tick=100, ticks=100):
+    """
+    Нагрузочный тест сервера арены: clients клиентов в том же процессе.
+
+    Клиенты читают кадры целиком и иногда присылают повороты, но не
+    разбирают их, чтобы замер показывал сервер, а не клиентов.
+    """
+    import asyncio
+    import random
+
+    from snake.protocol import FRAME
+    from snake.server import ArenaServer, percentiles
+
+    async def client(port, rng, stop):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            while not stop.is_set():
+                size, = FRAME.unpack(await reader.readexactly(FRAME.size))
+                await reader.readexactly(size)
+                if rng.random() < 0.1:
+                    writer.write(bytes([rng.randrange(4)]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def run():
+        server = ArenaServer(width, height, food=food, tick=tick, seed=1)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, backlog=clients)
+        port = listener.sockets[0].getsockname()[1]
+        stop = asyncio.Event()
+        rng = random.Random(1)
+        tasks = [asyncio.create_task(client(port, rng, stop)) for _ in range(clients)]
+        loop = asyncio.create_task(server.run())
+        while len(server.clients) < clients:
+            await asyncio.sleep(tick / 1000)
+        server.latencies.clear()
+        server.lateness.clear()
+        sent = server.bytes_sent
+        start = server.ticks
+        while server.ticks - start < ticks:
+            await asyncio.sleep(tick / 1000)
+        server.running = False
+        await loop
+        stop.set()
+        listener.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return {"clients": len(server.clients), "tick_ms": percentiles(server.latencies),
+                "late_ms": percentiles(server.lateness),
+                "bytes_per_client_tick": (server.bytes_sent - sent) / ticks / clients}
+
+    return asyncio.run(run())
+
+
+def bench_render(lengths=(10, 100, 1000, 5000), width=128, height=128, ticks=500):
+    """
+    Измеряет время отрисовки кадра на холсте tkinter: кругами (Renderer) и готовыми картинками (SpriteRenderer).
+    """
+    import tkinter as tk
+    from snake.renderer import Renderer, SpriteRenderer
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as error:
+        raise Skip(f"нет дисплея: {error}")
+    try:
+        canvas = tk.Canvas(root, width=width * 10, height=height * 10 + 80)
+        canvas.pack()
+        results = {}
+        for renderer_class in (Renderer, SpriteRenderer):
+            frames = results[renderer_class.__name__] = {}
+            for length in lengths:
+                engine = build_engine(length, width, height)
+                renderer = renderer_class(canvas, width, height)
+                renderer.reset()
+                renderer.draw_body(engine.snake.body)
+                renderer.draw_food(engine.food)
+                root.update()
+                elapsed = 0.0
+                for _ in range(ticks):
+                    if engine.done:
+                        break
+                    engine.step()
+                    start = time.perf_counter()
+                    renderer.draw_snake(engine.snake)
+                    renderer.draw_food(engine.food)
+                    root.update()
+                    elapsed += time.perf_counter() - start
+                frames[length] = elapsed / ticks * 1000
+        return {"frame_ms": results}
+    finally:
+        root.destroy()
+
+
+def widget_count(widget):
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def rss_bytes():
+    """
+    Текущий размер резидентной памяти процесса или None, если его не узнать (нет /proc).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def bench_soak(cycles=2000, warmup=100, width=20, height=20, budget_mb=SOAK_RSS_BUDGET_MB):
+    """
+    Проигрывает cycles партий до окончания игры с паузой и окном рекордов и проверяет,
+    что число виджетов, элементов холста, картинок и память процесса не растут.
+    """
+    import tempfile
+    import tkinter as tk
+    from types import SimpleNamespace
+
+    from snake.game import Game
+    from snake.paths import DATA_DIR_VARIABLE
+
+    space = SimpleNamespace(keysym="space")
+    data_dir = os.environ.get(DATA_DIR_VARIABLE)
+    with tempfile.TemporaryDirectory() as directory:
+        # Рекорды и записи игр пишутся во временный каталог, а не в каталог данных пользователя
+        os.environ[DATA_DIR_VARIABLE] = directory
+        try:
+            try:
+                game = Game(width, height)
+            except tk.TclError as error:
+                raise Skip(f"нет дисплея: {error}")
+            try:
+                start = None
+                for cycle in range(cycles + warmup):
+                    if cycle == warmup:
+                        start = (widget_count(game.root), len(game.canvas.find_all()), len(game.root.image_names()),
+                                 rss_bytes())
+                    game.start_game()
+                    for _ in range(5):
+                        game.play()
+                    game.key_press(space)
+                    game.key_press(space)
+                    game.scheduler.stop()
+                    game.game_over()
+                    game.high_scores_window.show()
+                    game.high_scores_window.hide()
+                    game.root.update()
+                end = (widget_count(game.root), len(game.canvas.find_all()), len(game.root.image_names()), rss_bytes())
+            finally:
+                game.high_scores.close()
+                game.root.destroy()
+        finally:
+            if data_dir is None:
+                del os.environ[DATA_DIR_VARIABLE]
+            else:
+                os.environ[DATA_DIR_VARIABLE] = data_dir
+
+    growth = None if start[3] is None or end[3] is None else (end[3] - start[3]) / 2 ** 20
+    within = start[:3] == end[:3] and (growth is None or growth <= budget_mb)
+    return {"cycles": cycles, "widgets": [start[0], end[0]], "canvas_items": [start[1], end[1]],
+            "images": [start[2], end[2]], "rss_growth_mb": growth, "budget_mb": budget_mb, "within_budget": within}
+
+
+def run_best(command, repeat):
+    """
+    Запускает команду repeat раз и возвращает лучшее время в мс.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(command, capture_output=True, cwd=ROOT)
+        if process.returncode != 0:
+            raise Skip(process.stderr.decode(errors="replace").strip().splitlines()[-1])
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def bench_import(repeat=5, budget_ms=IMPORT_BUDGET_MS):
+    """
+    Измеряет импорт модулей игры в отдельном процессе сверх запуска пустого интерпретатора.
+
+    Импорт не должен создавать окно, поэтому замер работает и без дисплея.
+    """
+    baseline = run_best([sys.executable, "-c", "pass"], repeat)
+    results = {}
+    for module in ("snake", "snake.engine", "snake.game"):
+        results[module] = run_best([sys.executable, "-c", f"import {module}"], repeat) - baseline
+    return {"import_ms": results, "budget_ms": budget_ms, "within_budget": max(results.values()) <= budget_ms}
+
+
+def bench_startup(repeat=5, budget_ms=FIRST_FRAME_BUDGET_MS):
+    """
+    Измеряет время холодного запуска до первого кадра для python -m snake и собранной программы в dist/game.
+    """
+    commands = {"python -m snake": [sys.executable, "-m", "snake"]}
+    for name in ("game", "game.exe"):
+        binary = os.path.join(ROOT, "dist", "game", name)
+        if os.path.isfile(binary) and os.access(binary, os.X_OK) and (name.endswith(".exe") == (os.name == "nt")):
+            commands["dist/game"] = [binary]
+    results = {}
+    for name, command in commands.items():
+        results[name] = run_best(command + ["--startup-benchmark"], repeat)
+    return {"first_frame_ms": results, "budget_ms": budget_ms, "within_budget": max(results.values()) <= budget_ms}
+
+
+BENCHMARKS = {
+    "body_memory": bench_body_memory,
+    "batch_env": bench_batch_env,
+    "rollout": bench_rollout,
+    "autopilot": bench_autopilot,
+    "planner": bench_planner,
+    "engine": bench_engine,
+    "rewind": bench_rewind,
+    "collision": bench_collision,
+    "food": bench_food,
+    "observation": bench_observation,
+    "snapshot": bench_snapshot,
+    "arena": bench_arena,
+    "server": bench_server,
+    "render": bench_render,
+    "soak": bench_soak,
+    "import": bench_import,
+    "startup": bench_startup,
+}
+
+
+def commit_id():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Замеры производительности игры")
+    parser.add_argument("names", nargs="*", metavar="имя", help="замеры: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--output", help="файл для результатов в формате JSON")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("неизвестные замеры: " + ", ".join(unknown))
+
+    commit = commit_id()
+    results = {"commit": commit, "timestamp": time.time(), "results": {}}
+    for name in args.names or BENCHMARKS:
+        try:
+            results["results"][name] = BENCHMARKS[name]()
+        except (ImportError, Skip) as error:
+            results["results"][name] = {"skipped": str(error)}
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    print(text)
+
+    output = args.output or os.path.join(ROOT, "bench_results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(text)
+
+    # Замеры с бюджетом проваливают запуск, если бюджет превышен
+    over = [name for name, result in results["results"].items() if result.get("within_budget") is False]
+    if over:
+        sys.exit("превышен бюджет: " + ", ".join(over))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
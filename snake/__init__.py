@@ -0,0 +1,5 @@
+"""
+Игра "Змейка".
+
+Модули пакета не выполняют ничего при импорте. Запуск игры: python -m snake.
+"""
@@ -0,0 +1,36 @@
+"""
+Запуск игры: python -m snake [--width 40] [--height 40] [--speed 100] [--cell 10]
+"""
+import argparse
+
+# Интервал шага хранится в снимке игры двумя байтами
+MAX_SPEED = 0xFFFF
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="snake", description="Змейка")
+    parser.add_argument("--width", type=int, default=40, help="ширина поля в клетках")
+    parser.add_argument("--height", type=int, default=40, help="высота поля в клетках")
+    parser.add_argument("--speed", type=int, default=100, help="начальный интервал шага в мс")
+    parser.add_argument("--cell", type=int, default=10, help="размер клетки в пикселях")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="закрыть окно сразу после первого кадра (замер времени запуска)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.speed <= MAX_SPEED:
+        parser.error(f"--speed должен быть от 1 до {MAX_SPEED} мс")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # tkinter загружается только после разбора аргументов, поэтому --help отвечает сразу
+    from .game import Game
+
+    game = Game(args.width, args.height, cell=args.cell, speed=args.speed)
+    if args.startup_benchmark:
+        game.root.after_idle(game.root.destroy)
+    game.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Арена: несколько змеек и несколько кусков еды на одном поле.
+
+Все змейки ходят одновременно. За шаг сначала убираются хвосты тех, кто
+не ест, затем ставятся все новые головы, и только после этого ищутся
+столкновения. Тела всех змеек отмечены в одной сетке занятости, поэтому
+столкновение - это голова в клетке, где частей тела больше одной: в чужом
+теле, в своем или в чужой голове (тогда погибают обе змейки). Проверка не
+зависит ни от числа змеек, ни от их длины. Отдельно ищутся змейки, которые
+поменялись головами, проехав друг сквозь друга: короткая змейка освобождает
+клетку, куда въезжает встречная, и сетка занятости такой обмен не видит.
+
+Змейкой управляет контроллер - вызываемый объект, который получает арену
+и змейку и возвращает направление или None, чтобы ехать прямо.
+"""
+import random
+from collections import deque, namedtuple
+from itertools import cycle
+
+from .body import FreeCells, SnakeBody
+from .engine import MOVES, push_turn
+
+# Итог шага арены: ходы живых змеек (номер, новая голова, освобожденная клетка хвоста или None),
+# номера погибших змеек, появившиеся заново змейки (номер, клетка) и замены еды (старая клетка, новая клетка)
+ArenaStep = namedtuple("ArenaStep", "moves died spawned food")
+
+
+class ArenaSnake:
+    """
+    Змейка арены: тело на общей сетке, направление, контроллер и счет.
+    """
+    __slots__ = ("body", "direction", "controller", "alive", "score")
+
+    def __init__(self, body, controller):
+        self.body = body
+        self.direction = (1, 0)
+        self.controller = controller
+        self.alive = False
+        self.score = 0
+
+
+class KeyboardController:
+    """
+    Управление с клавиатуры: нажатые повороты копятся в очереди, как в SnakeEngine.
+    """
+    def __init__(self):
+        self.turns = deque()
+        self.direction = (1, 0)
+
+    def queue_turn(self, direction):
+        push_turn(self.turns, self.direction, direction)
+
+    def __call__(self, arena, snake):
+        # Следующие нажатия проверяются относительно направления, в котором змейка поедет на этом шаге
+        turn = self.turns.popleft() if self.turns else None
+        dx, dy = snake.direction
+        self.direction = snake.direction if turn is None or turn == (-dx, -dy) else turn
+        return turn
+
+
+class ScriptedController:
+    """
+    Повторяет заданную последовательность направлений по кругу.
+    """
+    def __init__(self, directions):
+        self.directions = cycle(directions)
+
+    def __call__(self, arena, snake):
+        return next(self.directions)
+
+
+class GreedyController:
+    """
+    Простой ИИ: идет к ближайшей еде, обходя занятые клетки соседних ходов.
+
+    Цель выбирается заново только после того, как ее съели, поэтому
+    перебор всей еды случается редко.
+    """
+    def __init__(self):
+        self.target = None
+
+    def __call__(self, arena, snake):
+        head = snake.body.head_cell
+        if self.target not in arena.food:
+            self.target = arena.nearest_food(head)
+        back = (-snake.direction[0], -snake.direction[1])
+        best = None
+        best_distance = None
+        for direction in MOVES:
+            if direction == back:
+                continue
+            cell = arena.neighbor(head, direction)
+            if arena.occupancy[cell]:
+                continue
+            distance = arena.distance(cell, self.target) if self.target is not None else 0
+            if best is None or distance < best_distance:
+                best = direction
+                best_distance = distance
+        return best
+
+
+class ArenaEngine:
+    """
+    Правила арены без графического интерфейса.
+
+    controllers - по контроллеру на змейку, food - сколько еды лежит на поле
+    одновременно. Если respawn включен, погибшая змейка на следующем шаге
+    появляется заново в случайной свободной клетке. Змеек можно добавлять
+    и убирать между шагами (add_snake, remove_snake), места убранных
+    занимают новые.
+    """
+    def __init__(self, width, height, controllers, food=1, respawn=False, rng=None, seed=None):
+        self.width = width
+        self.height = height
+        self.controllers = list(controllers)
+        self.food_count = food
+        self.respawn = respawn
+        self.rng = rng if rng is not None else random
+        self.seed = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Расставляет змеек и еду заново. С зерном seed арена получает собственный генератор.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = random.Random(seed)
+        self.free = FreeCells(self.width * self.height)
+        self.occupancy = bytearray(self.width * self.height)
+        self.snakes = [ArenaSnake(self.new_body(), controller) for controller in self.controllers]
+        for snake in self.snakes:
+            if snake.controller is not None:
+                self.spawn_snake(snake)
+        self.food = set()
+        for _ in range(self.food_count):
+            self.spawn_food()
+        self.ticks = 0
+
+    def new_body(self):
+        # Буфер тела растет по мере надобности, чтобы сотни змеек не держали по буферу на все поле
+        return SnakeBody(self.width, self.height, self.free, self.occupancy, capacity=16)
+
+    def spawn_snake(self, snake):
+        """
+        Ставит змейку длиной в одну клетку в случайную свободную клетку.
+        """
+        if not self.free:
+            return False
+        cell = self.free.sample(self.rng)
+        snake.body.push_head(cell % self.width, cell // self.width)
+        snake.direction = self.rng.choice(MOVES)
+        snake.alive = True
+        snake.score = 0
+        return True
+
+    def add_snake(self, controller):
+        """
+        Добавляет змейку с контроллером и возвращает ее номер.
+        """
+        for index, snake in enumerate(self.snakes):
+            if snake.controller is None:
+                snake.controller = controller
+                self.controllers[index] = controller
+                break
+        else:
+            index = len(self.snakes)
+            snake = ArenaSnake(self.new_body(), controller)
+            self.snakes.append(snake)
+            self.controllers.append(controller)
+        self.spawn_snake(snake)
+        return index
+
+    def remove_snake(self, index):
+        """
+        Убирает змейку с поля. Ее место остается пустым до следующего add_snake.
+        """
+        snake = self.snakes[index]
+        self.kill(snake)
+        snake.controller = None
+        self.controllers[index] = None
+
+    def kill(self, snake):
+        snake.alive = False
+        while snake.body.length:
+            snake.body.pop_tail()
+
+    def spawn_food(self):
+        """
+        Кладет еду в случайную свободную клетку и возвращает ее номер или None, если места нет.
+        """
+        if not self.free:
+            return None
+        cell = self.free.sample(self.rng)
+        self.free.block(cell)
+        self.food.add(cell)
+        return cell
+
+    def neighbor(self, cell, direction):
+        """
+        Возвращает клетку, соседнюю с cell в направлении direction, с переходом через края.
+        """
+        x = (cell % self.width + direction[0]) % self.width
+        y = (cell // self.width + direction[1]) % self.height
+        return y * self.width + x
+
+    def distance(self, a, b):
+        """
+        Расстояние между клетками по тору в ходах.
+        """
+        dx = abs(a % self.width - b % self.width)
+        dy = abs(a // self.width - b // self.width)
+        return min(dx, self.width - dx) + min(dy, self.height - dy)
+
+    def nearest_food(self, cell):
+        if not self.food:
+            return None
+        return min(self.food, key=lambda food: self.distance(cell, food))
+
+    def xy(self, cell):
+        return cell % self.width, cell // self.width
+
+    def step(self):
+        """
+        Выполняет один одновременный ход всех змеек.
+        """
+        snakes = self.snakes
+        spawned = []
+        if self.respawn:
+            for index, snake in enumerate(snakes):
+                if not snake.alive and snake.controller is not None and self.spawn_snake(snake):
+                    spawned.append((index, snake.body.head))
+
+        # Направления и новые головы считаются до того, как кто-либо сдвинулся
+        heads = []
+        old_heads = {}
+        for index, snake in enumerate(snakes):
+            if not snake.alive:
+                heads.append(None)
+                continue
+            old_heads[snake.body.head_cell] = index
+            action = snake.controller(self, snake)
+            if action is not None and action != (-snake.direction[0], -snake.direction[1]):
+                snake.direction = action
+            heads.append(self.neighbor(snake.body.head_cell, snake.direction))
+
+        # Хвосты освобождаются раньше, чем появляются головы, поэтому в уходящий хвост въехать можно
+        moves = []
+        eaten = []
+        for index, snake in enumerate(snakes):
+            head = heads[index]
+            if head is None:
+                continue
+            tail = None
+            if head in self.food:
+                eaten.append(head)
+            else:
+                tail = self.xy(snake.body.pop_tail())
+            moves.append((index, self.xy(head), tail))
+        for snake, head in zip(snakes, heads):
+            if head is not None:
+                snake.body.push_head(head % self.width, head // self.width)
+
+        died = []
+        for index, snake in enumerate(snakes):
+            head = heads[index]
+            if head is None:
+                continue
+            # Встречные змейки, поменявшиеся клетками голов, столкнулись лоб в лоб
+            other = old_heads.get(head)
+            swapped = other is not None and other != index and old_heads.get(heads[other]) == index
+            if swapped or self.occupancy[head] > 1:
+                died.append(index)
+        for index in died:
+            self.kill(snakes[index])
+
+        eaten = set(eaten)
+        for index, head in enumerate(heads):
+            if head in eaten and snakes[index].alive:
+                snakes[index].score += 5
+        food = []
+        for cell in eaten:
+            self.food.discard(cell)
+            self.free.unblock(cell)
+            new = self.spawn_food()
+            food.append((self.xy(cell), None if new is None else self.xy(new)))
+        self.ticks += 1
+        return ArenaStep(moves, died, spawned, food)
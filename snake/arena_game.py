@@ -0,0 +1,124 @@
+import tkinter as tk
+from collections import deque
+
+from .arena import ArenaEngine, GreedyController, KeyboardController
+from .engine import DIRECTIONS
+from .renderer import make_renderer, screen_size
+from .scheduler import TickScheduler
+
+COLORS = ("green", "blue", "orange", "purple", "brown", "magenta", "cyan", "olive")
+
+
+class ArenaView:
+    """
+    Окно арены. Рисует изменения за шаг (ArenaStep), не зная, откуда они пришли:
+    от локального ArenaEngine или с сервера.
+    """
+    def __init__(self, width, height, cell=10, title="Змейка: арена"):
+        self.root = tk.Tk()
+        self.root.title(title)
+        self.root.resizable(False, False)
+        self.cell = cell
+        self.screen_width, self.screen_height = screen_size(width, height, cell)
+        self.canvas = tk.Canvas(self.root, width=self.screen_width, height=self.screen_height + 80,
+                                highlightthickness=0)
+        self.canvas.pack()
+        self.renderer = make_renderer(self.canvas, width, height, cell)
+        self.snake_items = []
+        self.food_items = {}
+        self.player = 0
+        self.score = 0
+
+        self.score_label = tk.Label(self.root, text="Счет: 0", font=("Arial", 18))
+        self.score_label.place(x=10, y=self.screen_height + 20)
+
+    def clear(self):
+        self.renderer.reset()
+        self.snake_items = []
+        self.food_items = {}
+        self.score = 0
+
+    def add_segment(self, index, position):
+        while len(self.snake_items) <= index:
+            self.snake_items.append(deque())
+        item = self.canvas.create_oval(*self.renderer.cell_box(*position), fill=COLORS[index % len(COLORS)],
+                                       outline="black" if index == self.player else "")
+        self.snake_items[index].appendleft(item)
+
+    def remove_snake(self, index):
+        for item in self.snake_items[index]:
+            self.canvas.delete(item)
+        self.snake_items[index].clear()
+
+    def add_food(self, position):
+        self.food_items[position] = self.canvas.create_oval(*self.renderer.cell_box(*position), fill="red")
+
+    def apply(self, result):
+        """
+        Переносит элементы холста только у изменившихся змеек и еды.
+        """
+        for index, head in result.spawned:
+            self.add_segment(index, head)
+            if index == self.player:
+                self.score = 0
+        for index, head, tail in result.moves:
+            if tail is None:
+                self.add_segment(index, head)
+                if index == self.player:
+                    self.score += 5
+            else:
+                items = self.snake_items[index]
+                item = items.pop()
+                self.canvas.coords(item, *self.renderer.cell_box(*head))
+                items.appendleft(item)
+            if index == self.player:
+                self.renderer.follow(*head)
+        for index in result.died:
+            self.remove_snake(index)
+        for old, new in result.food:
+            self.canvas.delete(self.food_items.pop(old))
+            if new is not None:
+                self.add_food(new)
+        self.score_label.config(text=f"Счет: {self.score}")
+
+
+class ArenaGame(ArenaView):
+    """
+    Локальная арена: змейка игрока (стрелки) против змеек под управлением ИИ.
+    """
+    def __init__(self, width, height, opponents=7, food=5, cell=10):
+        super().__init__(width, height, cell)
+        self.controller = KeyboardController()
+        controllers = [self.controller] + [GreedyController() for _ in range(opponents)]
+        self.engine = ArenaEngine(width, height, controllers, food=food, respawn=True)
+        self.scheduler = TickScheduler(self.root, self.play, lambda: 100)
+
+    def reset_game(self):
+        """
+        Расставляет змеек и еду заново и рисует их.
+        """
+        self.scheduler.stop()
+        self.engine.reset()
+        self.clear()
+        for index, snake in enumerate(self.engine.snakes):
+            if snake.alive:
+                self.add_segment(index, snake.body.head)
+        for cell in self.engine.food:
+            self.add_food(self.engine.xy(cell))
+
+    def play(self):
+        self.apply(self.engine.step())
+
+    def key_press(self, event):
+        if event.keysym in DIRECTIONS:
+            self.controller.queue_turn(DIRECTIONS[event.keysym])
+
+    def run(self):
+        self.reset_game()
+        self.scheduler.start()
+        self.root.bind("<Key>", self.key_press)
+        self.root.mainloop()
+
+
+if __name__ == "__main__":
+    ArenaGame(60, 60).run()
@@ -0,0 +1,350 @@
+"""
+Автопилот: выбирает направление змейки вместо игрока.
+
+Поле расстояний до еды строится поиском в ширину по тору (с переходом
+через края, как в SnakeEngine) в обход стен и тела змейки и хранится
+между шагами. Поле не пересчитывается заново на каждом шаге, а чинится:
+за шаг голова занимает клетку, а хвост освобождает свою, и пересчитываются
+только клетки, чье расстояние от этого меняется; так же чинится поле при
+смене стен. Заново поле строится, только когда еда переместилась (у поля
+другой исток) или змейка сдвинулась не на один шаг (перезапуск,
+перемотка, загрузка снимка). Автопилот идет к еде по этому полю, а
+каждый ход проверяет на безопасность: после него голова должна
+дотягиваться до хвоста. На длинной змейке он переходит на гамильтонов
+цикл, который обходит все клетки поля.
+"""
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from itertools import compress
+
+from .engine import MOVES
+
+UNREACHABLE = 0x7FFFFFFF
+
+
+def neighbor_table(width, height):
+    """
+    Возвращает соседей каждой клетки тора: четыре номера клетки подряд в порядке MOVES.
+    """
+    table = array("I", bytes(4 * 4 * width * height))
+    for y in range(height):
+        for x in range(width):
+            cell = 4 * (y * width + x)
+            for k, (dx, dy) in enumerate(MOVES):
+                table[cell + k] = (y + dy) % height * width + (x + dx) % width
+    return table
+
+
+class DistanceField:
+    """
+    Расстояния от истока (еды) до всех клеток в обход занятых клеток.
+
+    blocked - занятые клетки (стены и тело), у них и у недостижимых клеток
+    расстояние UNREACHABLE. Исток занятым не считается. block и unblock
+    меняют одну клетку и чинят поле вокруг нее, не обходя все поле.
+    """
+    def __init__(self, neighbors, source, blocked):
+        self.neighbors = neighbors
+        self.source = source
+        self.blocked = blocked
+        blocked[source] = 0
+        self.distances = array("i", [UNREACHABLE]) * len(blocked)
+        self.fill()
+
+    def fill(self):
+        """
+        Строит поле целиком поиском в ширину от истока, по уровням.
+        """
+        neighbors = self.neighbors
+        distances = self.distances
+        # Занятые клетки на время обхода помечены -1, чтобы проверять соседа одним сравнением
+        taken = list(compress(range(len(self.blocked)), self.blocked))
+        for cell in taken:
+            distances[cell] = -1
+        distances[self.source] = 0
+        frontier = [self.source]
+        level = 0
+        while frontier:
+            level += 1
+            following = []
+            for cell in frontier:
+                for other in neighbors[4 * cell:4 * cell + 4]:
+                    if distances[other] == UNREACHABLE:
+                        distances[other] = level
+                        following.append(other)
+            frontier = following
+        for cell in taken:
+            distances[cell] = UNREACHABLE
+
+    def spread(self, queue):
+        """
+        Распространяет уменьшение расстояний от клеток queue поиском в ширину.
+        """
+        neighbors = self.neighbors
+        blocked = self.blocked
+        distances = self.distances
+        queue = deque(queue)
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for k in range(4 * cell, 4 * cell + 4):
+                other = neighbors[k]
+                if distances[other] > distance and not blocked[other]:
+                    distances[other] = distance
+                    queue.append(other)
+
+    def nearest(self, cell):
+        """
+        Возвращает наименьшее расстояние среди соседей клетки.
+        """
+        neighbors = self.neighbors
+        distances = self.distances
+        return min(distances[neighbors[k]] for k in range(4 * cell, 4 * cell + 4))
+
+    def unblock(self, cell):
+        """
+        Освобождает клетку: расстояния могут только уменьшиться, и только у клеток, путь которых теперь короче через нее.
+        """
+        if not self.blocked[cell]:
+            return
+        self.blocked[cell] = 0
+        nearest = self.nearest(cell)
+        if nearest != UNREACHABLE:
+            self.distances[cell] = nearest + 1
+            self.spread([cell])
+
+    def block(self, cell):
+        """
+        Занимает клетку и пересчитывает клетки, у которых все кратчайшие пути проходили через нее.
+        """
+        if self.blocked[cell] or cell == self.source:
+            return
+        neighbors = self.neighbors
+        distances = self.distances
+        self.blocked[cell] = 1
+        level = distances[cell]
+        distances[cell] = UNREACHABLE
+        if level == UNREACHABLE:
+            return
+
+        # По уровням от занятой клетки: клетка теряет расстояние, если у нее не осталось соседа на уровень ближе
+        lost = []
+        frontier = [cell]
+        while frontier:
+            level += 1
+            following = []
+            for parent in frontier:
+                for k in range(4 * parent, 4 * parent + 4):
+                    other = neighbors[k]
+                    if distances[other] != level:
+                        continue
+                    if any(distances[neighbors[j]] == level - 1 for j in range(4 * other, 4 * other + 4)):
+                        continue
+                    distances[other] = UNREACHABLE
+                    lost.append(other)
+                    following.append(other)
+            frontier = following
+
+        # Потерявшие расстояние клетки получают его заново от уцелевших соседей, ближайшие первыми
+        heap = []
+        for other in lost:
+            nearest = self.nearest(other)
+            if nearest != UNREACHABLE:
+                heappush(heap, (nearest + 1, other))
+        blocked = self.blocked
+        while heap:
+            distance, other = heappop(heap)
+            if distance >= distances[other]:
+                continue
+            distances[other] = distance
+            for k in range(4 * other, 4 * other + 4):
+                following = neighbors[k]
+                if distances[following] > distance + 1 and not blocked[following]:
+                    heappush(heap, (distance + 1, following))
+
+
+def hamiltonian_cycle(width, height):
+    """
+    Возвращает для каждой клетки следующую клетку гамильтонова цикла или None,
+    если у поля обе стороны нечетные.
+    """
+    transpose = height % 2 != 0
+    if transpose:
+        width, height = height, width
+    if height % 2 != 0 or width < 2:
+        return None
+    order = [(0, 0)]
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        order.extend((x, y) for x in xs)
+    order.extend((0, y) for y in range(height - 1, 0, -1))
+    if transpose:
+        order = [(y, x) for x, y in order]
+        width, height = height, width
+    following = array("I", bytes(4 * width * height))
+    for i, (x, y) in enumerate(order):
+        nx, ny = order[(i + 1) % len(order)]
+        following[y * width + x] = ny * width + nx
+    return following
+
+
+class Autopilot:
+    """
+    Выбирает направление для SnakeEngine.
+    """
+    def __init__(self, engine, cycle_ratio=0.5):
+        self.engine = engine
+        self.cycle_ratio = cycle_ratio
+        self.board = None
+        self.neighbors = None
+        self.cycle = None
+        self.walls = set()
+        self.field = None
+        self.field_ticks = None
+        self.field_head = None
+        self.field_tail = None
+        self.field_length = None
+        self.field_walls = set()
+        self.rebuilds = 0
+
+    def prepare(self):
+        """
+        Строит таблицы соседей и цикл для текущего размера поля.
+        """
+        board = (self.engine.width, self.engine.height)
+        if board != self.board:
+            self.board = board
+            self.neighbors = neighbor_table(*board)
+            self.cycle = hamiltonian_cycle(*board)
+            self.field = None
+
+    def distance_field(self):
+        """
+        Возвращает поле расстояний до еды для текущего положения змейки.
+
+        Если с прошлого вызова змейка сделала ровно один шаг и еда не
+        сменилась, поле чинится по освободившемуся хвосту, новой голове и
+        сменившимся стенам; иначе строится заново.
+        """
+        engine = self.engine
+        body = engine.snake.body
+        head = body.head_cell
+        food = engine.food.y * engine.width + engine.food.x
+        field = self.field
+        if field is not None and field.source == food and len(body) == self.field_length:
+            if engine.ticks == self.field_ticks and head == self.field_head and self.walls == self.field_walls:
+                return field.distances
+            moved = self.neighbors[4 * head:4 * head + 4]
+            if (engine.ticks == self.field_ticks + 1 and self.field_head in moved
+                    and (len(body) == 1 or body.cells[(body.start + 1) % body.capacity] == self.field_head)):
+                for wall in self.field_walls - self.walls:
+                    if not body.occupancy[wall]:
+                        field.unblock(wall)
+                for wall in self.walls - self.field_walls:
+                    field.block(wall)
+                if not body.occupancy[self.field_tail] and self.field_tail not in self.walls:
+                    field.unblock(self.field_tail)
+                field.block(head)
+                self.remember(body)
+                return field.distances
+
+        blocked = bytearray(body.occupancy)
+        for wall in self.walls:
+            blocked[wall] = 1
+        self.field = DistanceField(self.neighbors, food, blocked)
+        self.rebuilds += 1
+        self.remember(body)
+        return self.field.distances
+
+    def remember(self, body):
+        self.field_ticks = self.engine.ticks
+        self.field_head = body.head_cell
+        self.field_tail = body.tail_cell
+        self.field_length = len(body)
+        self.field_walls = self.walls
+
+    def free_after_move(self, cell, eating):
+        """
+        Проверяет, можно ли встать в клетку: хвост освобождает свою клетку, если змейка не ест.
+        """
+        body = self.engine.snake.body
+        if cell in self.walls:
+            return False
+        if body.occupancy[cell] == 0:
+            return True
+        return not eating and cell == body.tail_cell and body.occupancy[cell] == 1
+
+    def reachable(self, start, limit):
+        """
+        Считает клетки, доступные из start после хода, пока не найден хвост или не набрано limit клеток.
+
+        Возвращает (найден ли хвост, число клеток).
+        """
+        body = self.engine.snake.body
+        occupancy = body.occupancy
+        tail = body.tail_cell
+        if start == tail:
+            return True, 1
+        neighbors = self.neighbors
+        walls = self.walls
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for k in range(4 * cell, 4 * cell + 4):
+                other = neighbors[k]
+                if other in seen:
+                    continue
+                if other == tail:
+                    return True, len(seen)
+                if occupancy[other] or other in walls:
+                    continue
+                seen.add(other)
+                if len(seen) >= limit:
+                    return True, len(seen)
+                queue.append(other)
+        return False, len(seen)
+
+    def direction_to(self, cell):
+        engine = self.engine
+        head = engine.snake.body.head_cell
+        for k, direction in enumerate(MOVES):
+            if self.neighbors[4 * head + k] == cell:
+                return direction
+        return engine.direction
+
+    def choose(self):
+        """
+        Возвращает направление для следующего шага.
+        """
+        self.prepare()
+        engine = self.engine
+        self.walls = {y * engine.width + x for x, y in engine.wall_cells}
+        body = engine.snake.body
+        head = body.head_cell
+        food = engine.food.y * engine.width + engine.food.x
+        reverse = (-engine.direction[0], -engine.direction[1])
+
+        if self.cycle is not None and len(body) >= self.cycle_ratio * engine.width * engine.height:
+            following = self.cycle[head]
+            if self.free_after_move(following, following == food):
+                return self.direction_to(following)
+
+        field = self.distance_field()
+        candidates = []
+        for k, direction in enumerate(MOVES):
+            cell = self.neighbors[4 * head + k]
+            if direction != reverse and self.free_after_move(cell, cell == food):
+                candidates.append((field[cell], k, cell, direction))
+        candidates.sort()
+
+        best = None
+        best_space = -1
+        for _, _, cell, direction in candidates:
+            safe, space = self.reachable(cell, len(body) + 1)
+            if safe:
+                return direction
+            if space > best_space:
+                best, best_space = direction, space
+        return best if best is not None else engine.direction
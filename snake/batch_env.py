@@ -0,0 +1,111 @@
+import numpy as np
+
+# Направления в порядке Up, Down, Left, Right, как в engine.DIRECTIONS
+DX = np.array([0, 0, -1, 1], dtype=np.int64)
+DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int64)
+RIGHT = 3
+
+
+class BatchSnakeEnv:
+    """
+    N независимых игр, которые продвигаются одним векторным шагом.
+
+    Правила совпадают с SnakeEngine: переход через края поля, +5 очков за еду,
+    смерть при столкновении с телом или стеной. Еда, в отличие от SnakeEngine,
+    выбирается среди всех клеток поля. Закончившиеся игры сразу
+    начинаются заново. Тело каждой игры хранится в строке кольцевого
+    буфера упакованных клеток, занятость поля - в строке сетки.
+    """
+    def __init__(self, n, width, height, walls=False, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.walls_enabled = walls
+        self.rng = np.random.default_rng(seed)
+        self.capacity = width * height + 1
+        self.rows = np.arange(n)
+        self.cells = np.zeros((n, self.capacity), dtype=np.int32)
+        self.start = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.occupancy = np.zeros((n, width * height), dtype=np.uint8)
+        self.walls = np.zeros((n, width * height), dtype=bool)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.direction = np.full(n, RIGHT, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+        Начинает заново все игры или только отмеченные в mask.
+        """
+        rows = self.rows if mask is None else self.rows[mask]
+        if len(rows) == 0:
+            return
+        center = (self.height // 2) * self.width + self.width // 2
+        self.occupancy[rows] = 0
+        self.walls[rows] = False
+        self.start[rows] = 0
+        self.length[rows] = 1
+        self.cells[rows, 0] = center
+        self.occupancy[rows, center] = 1
+        self.direction[rows] = RIGHT
+        self.score[rows] = 0
+        self.food[rows] = self.rng.integers(0, self.width * self.height, size=len(rows))
+
+    @property
+    def head(self):
+        return self.cells[self.rows, self.start]
+
+    def step(self, actions):
+        """
+        Продвигает все игры на один шаг.
+
+        actions - массив направлений 0..3 (Up, Down, Left, Right) или -1, чтобы продолжить движение.
+        Возвращает награды и признаки окончания игр до автоматического перезапуска.
+        """
+        rows = self.rows
+        actions = np.asarray(actions, dtype=np.int64)
+        turn = (actions >= 0) & (actions != OPPOSITE[self.direction])
+        self.direction = np.where(turn, actions, self.direction)
+
+        head = self.cells[rows, self.start]
+        new_x = (head % self.width + DX[self.direction]) % self.width
+        new_y = (head // self.width + DY[self.direction]) % self.height
+        new_head = new_y * self.width + new_x
+
+        # Хвост освобождается до проверки столкновения, как в SnakeEngine
+        ate = new_head == self.food
+        moving = rows[~ate]
+        tail = self.cells[moving, (self.start[moving] + self.length[moving] - 1) % self.capacity]
+        self.occupancy[moving, tail] -= 1
+        self.length[moving] -= 1
+
+        done = (self.occupancy[rows, new_head] > 0) | self.walls[rows, new_head]
+
+        self.start = (self.start - 1) % self.capacity
+        self.cells[rows, self.start] = new_head
+        self.occupancy[rows, new_head] += 1
+        self.length += 1
+
+        rewards = np.where(ate, 5, 0)
+        eaten = rows[ate]
+        if len(eaten):
+            self.score[eaten] += 5
+            self.food[eaten] = self.rng.integers(0, self.width * self.height, size=len(eaten))
+            if self.walls_enabled:
+                self.update_walls(eaten)
+
+        self.reset(done)
+        return rewards, done
+
+    def update_walls(self, eaten):
+        """
+        Расставляет по пять новых стен в играх, где счет достиг 500 и кратен 200.
+        """
+        score = self.score[eaten]
+        rows = eaten[(score >= 500) & (score % 200 == 0)]
+        if len(rows):
+            self.walls[rows] = False
+            cells = self.rng.integers(0, self.width * self.height, size=(len(rows), 5))
+            self.walls[rows[:, None], cells] = True
@@ -0,0 +1,279 @@
+from array import array
+
+# Массивы 0, 1, ..., n-1 по размеру поля: новые списки свободных клеток копируют их, а не строят заново
+IDENTITY = {}
+
+
+class FreeCells:
+    """
+    Индексируемый список свободных клеток поля.
+
+    Свободные клетки лежат в начале массива cells, а positions хранит
+    место каждой клетки в нем. Занятие и освобождение клетки - обмен
+    с последним свободным элементом, поэтому и они, и выбор случайной
+    свободной клетки выполняются за O(1) при любой заполненности поля.
+    Клетку могут занимать несколько препятствий сразу (тело и стена),
+    она свободна, пока счетчик blocked равен нулю.
+    """
+    __slots__ = ("cells", "positions", "blocked", "size")
+
+    def __init__(self, count):
+        identity = IDENTITY.get(count)
+        if identity is None:
+            identity = IDENTITY[count] = array("I", range(count))
+        self.cells = identity[:]
+        self.positions = identity[:]
+        self.blocked = bytearray(count)
+        self.size = count
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, cell):
+        return self.blocked[cell] == 0
+
+    def swap(self, cell, index):
+        """
+        Ставит клетку на позицию index, а стоявшую там - на ее место.
+        """
+        other = self.cells[index]
+        position = self.positions[cell]
+        self.cells[position] = other
+        self.positions[other] = position
+        self.cells[index] = cell
+        self.positions[cell] = index
+
+    def block(self, cell):
+        """
+        Отмечает клетку занятой.
+        """
+        if self.blocked[cell] == 0:
+            self.size -= 1
+            self.swap(cell, self.size)
+        self.blocked[cell] += 1
+
+    def unblock(self, cell):
+        """
+        Снимает с клетки одно препятствие.
+        """
+        self.blocked[cell] -= 1
+        if self.blocked[cell] == 0:
+            self.swap(cell, self.size)
+            self.size += 1
+
+    def sample(self, rng):
+        """
+        Возвращает случайную свободную клетку.
+        """
+        return self.cells[rng.randrange(self.size)]
+
+    def copy(self):
+        """
+        Возвращает независимую копию: массивы копируются целиком, без создания объектов на клетку.
+        """
+        other = FreeCells.__new__(FreeCells)
+        other.cells = self.cells[:]
+        other.positions = self.positions[:]
+        other.blocked = self.blocked[:]
+        other.size = self.size
+        return other
+
+
+class SnakeBody:
+    """
+    Тело змейки: кольцевой буфер клеток от головы к хвосту и сетка занятости поля.
+
+    Клетка упакована в одно число y * width + x. Буфер выделяется один раз
+    на все поле, поэтому движение не создает объектов и выполняется за O(1).
+    Сетка хранит число частей тела в каждой клетке, и проверка
+    столкновения не зависит от длины змейки. Если передан список
+    свободных клеток free, тело занимает и освобождает в нем свои клетки.
+    Несколько тел могут делить одну сетку occupancy, тогда head_collides
+    находит столкновение и с чужим телом. Таким телам можно задать
+    небольшую начальную емкость capacity: буфер удваивается, когда
+    заполнится.
+    """
+    __slots__ = ("width", "height", "capacity", "cells", "start", "length", "occupancy", "free")
+
+    def __init__(self, width, height, free=None, occupancy=None, capacity=None):
+        self.width = width
+        self.height = height
+        # Одна лишняя ячейка нужна для головы, въехавшей в тело на последнем шаге
+        self.capacity = width * height + 1 if capacity is None else capacity
+        self.cells = array("I", bytes(4 * self.capacity))
+        self.start = 0
+        self.length = 0
+        self.occupancy = bytearray(width * height) if occupancy is None else occupancy
+        self.free = free
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self.xy(self.cells[(self.start + i) % self.capacity])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("индекс вне тела змейки")
+        return self.xy(self.cells[(self.start + index) % self.capacity])
+
+    def __contains__(self, cell):
+        x, y = cell
+        return self.occupancy[y * self.width + x] > 0
+
+    def xy(self, cell):
+        """
+        Распаковывает номер клетки в координаты.
+        """
+        return cell % self.width, cell // self.width
+
+    @property
+    def head_cell(self):
+        return self.cells[self.start]
+
+    @property
+    def tail_cell(self):
+        return self.cells[(self.start + self.length - 1) % self.capacity]
+
+    @property
+    def head(self):
+        return self.xy(self.head_cell)
+
+    @property
+    def tail(self):
+        return self.xy(self.tail_cell)
+
+    def count(self, x, y):
+        """
+        Возвращает число частей тела в клетке.
+        """
+        return self.occupancy[y * self.width + x]
+
+    def grow(self):
+        """
+        Удваивает буфер, переставляя тело в его начало.
+        """
+        cells = self.cells[self.start:] + self.cells[:self.start]
+        cells.frombytes(bytes(4 * self.capacity))
+        self.cells = cells
+        self.start = 0
+        self.capacity *= 2
+
+    def copy(self, free=None, slack=16):
+        """
+        Возвращает копию тела, которая занимает и освобождает клетки в списке free.
+
+        Копируется только занятая часть кольцевого буфера и еще slack ячеек,
+        дальше буфер копии удваивается по мере роста.
+        """
+        other = SnakeBody.__new__(SnakeBody)
+        other.width = self.width
+        other.height = self.height
+        end = self.start + self.length
+        if end <= self.capacity:
+            cells = self.cells[self.start:end]
+        else:
+            cells = self.cells[self.start:] + self.cells[:end - self.capacity]
+        cells.frombytes(bytes(4 * slack))
+        other.cells = cells
+        other.capacity = self.length + slack
+        other.start = 0
+        other.length = self.length
+        other.occupancy = self.occupancy[:]
+        other.free = free
+        return other
+
+    def push_head(self, x, y):
+        """
+        Добавляет новую голову.
+        """
+        cell = y * self.width + x
+        if self.length == self.capacity:
+            self.grow()
+        self.start = (self.start - 1) % self.capacity
+        self.cells[self.start] = cell
+        self.length += 1
+        self.occupancy[cell] += 1
+        if self.free is not None:
+            self.free.block(cell)
+
+    def push_tail(self, x, y):
+        """
+        Добавляет часть тела в конец хвоста.
+        """
+        cell = y * self.width + x
+        if self.length == self.capacity:
+            self.grow()
+        self.cells[(self.start + self.length) % self.capacity] = cell
+        self.length += 1
+        self.occupancy[cell] += 1
+        if self.free is not None:
+            self.free.block(cell)
+
+    def pop_head(self):
+        """
+        Удаляет голову и возвращает номер ее клетки.
+        """
+        cell = self.cells[self.start]
+        self.start = (self.start + 1) % self.capacity
+        self.length -= 1
+        self.occupancy[cell] -= 1
+        if self.free is not None:
+            self.free.unblock(cell)
+        return cell
+
+    def pop_tail(self):
+        """
+        Удаляет хвост и возвращает номер его клетки.
+        """
+        self.length -= 1
+        cell = self.cells[(self.start + self.length) % self.capacity]
+        self.occupancy[cell] -= 1
+        if self.free is not None:
+            self.free.unblock(cell)
+        return cell
+
+    def head_collides(self):
+        """
+        Проверяет, попала ли голова в клетку, уже занятую телом.
+        """
+        return self.occupancy[self.cells[self.start]] > 1
+
+
+class Snake:
+    """
+    Голова змейки: направление движения и ее тело.
+    """
+    __slots__ = ("body", "direction")
+
+    def __init__(self, x, y, width, height, free=None):
+        self.body = SnakeBody(width, height, free)
+        self.body.push_head(x, y)
+        self.direction = (1, 0)
+
+    def copy(self, free=None):
+        other = Snake.__new__(Snake)
+        other.body = self.body.copy(free)
+        other.direction = self.direction
+        return other
+
+    @property
+    def x(self):
+        return self.body.head_cell % self.body.width
+
+    @property
+    def y(self):
+        return self.body.head_cell // self.body.width
+
+    def move(self, dx, dy):
+        self.body.push_head((self.x + dx) % self.body.width, (self.y + dy) % self.body.height)
+        self.body.pop_tail()
+
+    def eat(self, food):
+        """
+        Добавляет новую часть к телу змейки, когда она съедает еду.
+        """
+        self.body.push_tail(food.x, food.y)
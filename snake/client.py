@@ -0,0 +1,91 @@
+"""
+Окно арены как тонкий клиент сервера (server.py).
+
+Клиент ничего не считает сам: он отправляет нажатые стрелки и рисует
+изменения, присланные сервером. Сокет неблокирующий и опрашивается из
+цикла событий tkinter.
+
+Запуск: python -m snake.client [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import socket
+
+from .arena_game import ArenaView
+from .engine import DIRECTIONS
+from .protocol import CODES, ArenaMirror, read_frames
+from .server import PORT
+
+# Как часто опрашивать сокет, мс
+POLL_INTERVAL = 5
+
+
+class NetworkGame(ArenaView):
+    """
+    Арена, которую ведет сервер.
+    """
+    def __init__(self, host="127.0.0.1", port=PORT, cell=10):
+        self.socket = socket.create_connection((host, port))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = bytearray()
+        self.mirror = ArenaMirror()
+        # Снимок приходит первым кадром, до него размер поля неизвестен
+        frames = []
+        while not frames:
+            data = self.socket.recv(65536)
+            if not data:
+                raise ConnectionError("сервер закрыл соединение")
+            self.buffer += data
+            frames = read_frames(self.buffer)
+        self.mirror.load_snapshot(frames[0])
+        super().__init__(self.mirror.width, self.mirror.height, cell, title="Змейка: сетевая арена")
+        self.player = self.mirror.you
+        self.draw_snapshot()
+        self.socket.setblocking(False)
+        for payload in frames[1:]:
+            self.receive(payload)
+
+    def draw_snapshot(self):
+        self.clear()
+        for index, body in enumerate(self.mirror.bodies):
+            for cell in reversed(body):
+                self.add_segment(index, self.mirror.xy(cell))
+        for cell in self.mirror.food:
+            self.add_food(self.mirror.xy(cell))
+
+    def receive(self, payload):
+        left, result = self.mirror.decode_delta(payload)
+        for index in left:
+            self.remove_snake(index)
+        self.apply(result)
+
+    def poll(self):
+        try:
+            while True:
+                data = self.socket.recv(65536)
+                if not data:
+                    self.root.destroy()
+                    return
+                self.buffer += data
+        except BlockingIOError:
+            pass
+        for payload in read_frames(self.buffer):
+            self.receive(payload)
+        self.root.after(POLL_INTERVAL, self.poll)
+
+    def key_press(self, event):
+        if event.keysym in DIRECTIONS:
+            self.socket.send(bytes([CODES[DIRECTIONS[event.keysym]]]))
+
+    def run(self):
+        self.root.bind("<Key>", self.key_press)
+        self.root.after(POLL_INTERVAL, self.poll)
+        self.root.mainloop()
+        self.socket.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Клиент сетевой арены")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    NetworkGame(args.host, args.port).run()
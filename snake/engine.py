@@ -0,0 +1,257 @@
+import random
+from collections import deque, namedtuple
+
+from .body import FreeCells, Snake
+
+# Направления движения по названиям клавиш
+DIRECTIONS = {
+    "Up": (0, -1),
+    "Down": (0, 1),
+    "Left": (-1, 0),
+    "Right": (1, 0),
+}
+
+# Направления в постоянном порядке: номер направления в этом списке - его код в записях, снимках и сообщениях
+MOVES = list(DIRECTIONS.values())
+
+# Сколько поворотов игрок может нажать заранее
+TURN_QUEUE_SIZE = 3
+
+# Итог одного шага: новая голова, освобожденная клетка хвоста (или None, если змейка выросла),
+# съедена ли еда, сменились ли стены и окончена ли игра
+StepResult = namedtuple("StepResult", "head tail ate walls_changed done")
+
+
+def push_turn(turns, current, direction):
+    """
+    Ставит поворот в очередь turns, проверяя его относительно последнего поворота в очереди
+    (или текущего направления current, если очередь пуста).
+
+    Повторы, развороты и нажатия сверх TURN_QUEUE_SIZE отбрасываются.
+    """
+    last = turns[-1] if turns else current
+    dx, dy = direction
+    if len(turns) < TURN_QUEUE_SIZE and (dx, dy) != last and (dx, dy) != (-last[0], -last[1]):
+        turns.append((dx, dy))
+
+
+class Food:
+    """
+    Представляет еду, которую змейка может съесть.
+    """
+    __slots__ = ("x", "y", "direction")
+
+    def __init__(self, x, y, direction):
+        self.x = x
+        self.y = y
+        self.direction = direction
+
+
+class Wall:
+    """
+    Препятствие, появляющееся на поле при большом счете.
+    """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class SnakeEngine:
+    """
+    Правила игры без графического интерфейса.
+
+    Движение с переходом через края поля, поедание еды, начисление очков,
+    ускорение каждые 100 очков и, если включены стены, их смена каждые
+    200 очков после 500. speed - начальный интервал шага в мс.
+
+    Все случайные решения берутся из rng (по умолчанию - модуль random).
+    Если задано зерно seed, игра получает собственный генератор и
+    полностью воспроизводится по зерну и последовательности направлений.
+    Еда появляется только в клетках, свободных от змейки и стен.
+
+    Нажатые повороты копятся в очереди turns, и каждый шаг применяет
+    не больше одного из них, поэтому быстрые нажатия не теряются и не
+    разворачивают змейку в собственное тело.
+    """
+    def __init__(self, width, height, walls=False, rng=None, seed=None, speed=100):
+        self.width = width
+        self.height = height
+        self.base_speed = speed
+        self.walls_enabled = walls
+        self.rng = rng if rng is not None else random
+        self.seed = None
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Сбрасывает все игровые переменные. С зерном seed игра начинается с нового генератора.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = random.Random(seed)
+        self.free = FreeCells(self.width * self.height)
+        self.snake = Snake(self.width // 2, self.height // 2, self.width, self.height, self.free)
+        self.walls = []
+        self.wall_cells = set()
+        self.food = self.spawn_food()
+        self.direction = (1, 0)
+        self.turns = deque()
+        self.score = 0
+        self.speed = self.base_speed
+        self.speed_multiplier = 1.0
+        self.ticks = 0
+        self.done = False
+
+    def clone(self, rng=None):
+        """
+        Возвращает независимую копию состояния игры для планирования ходов.
+
+        Копия получает свой генератор rng (по умолчанию - новый random.Random),
+        поэтому ее шаги не сдвигают случайную последовательность исходной
+        игры. Тело и список свободных клеток копируются как плоские массивы,
+        еда и стены - общие объекты: движок их не изменяет, а заменяет.
+        """
+        other = SnakeEngine.__new__(SnakeEngine)
+        other.width = self.width
+        other.height = self.height
+        other.base_speed = self.base_speed
+        other.walls_enabled = self.walls_enabled
+        other.rng = rng if rng is not None else random.Random()
+        other.seed = None
+        other.free = self.free.copy()
+        other.snake = self.snake.copy(other.free)
+        other.walls = list(self.walls)
+        other.wall_cells = set(self.wall_cells)
+        other.food = self.food
+        other.direction = self.direction
+        other.turns = deque(self.turns)
+        other.score = self.score
+        other.speed = self.speed
+        other.speed_multiplier = self.speed_multiplier
+        other.ticks = self.ticks
+        other.done = self.done
+        return other
+
+    def spawn_food(self):
+        """
+        Создает еду в случайной свободной клетке.
+        """
+        if self.free:
+            cell = self.free.sample(self.rng)
+        else:
+            # Свободных клеток не осталось, еда появляется где угодно
+            cell = self.rng.randrange(self.width * self.height)
+        return Food(cell % self.width, cell // self.width, self.rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1)]))
+
+    def update_walls(self):
+        """
+        Расставляет пять новых стен в случайных клетках.
+        """
+        for x, y in self.wall_cells:
+            self.free.unblock(y * self.width + x)
+        # Новые список и множество, а не очистка старых: на старые могут ссылаться записи перемотки
+        self.walls = []
+        self.wall_cells = set()
+        for _ in range(5):
+            x = self.rng.randint(0, self.width - 1)
+            y = self.rng.randint(0, self.height - 1)
+            self.walls.append(Wall(x, y))
+            self.wall_cells.add((x, y))
+        for x, y in self.wall_cells:
+            self.free.block(y * self.width + x)
+
+    def turn(self, direction):
+        """
+        Меняет направление, если это не разворот на 180 градусов.
+        """
+        dx, dy = direction
+        if (dx, dy) != (-self.direction[0], -self.direction[1]):
+            self.direction = (dx, dy)
+
+    def queue_turn(self, direction):
+        """
+        Ставит поворот в очередь, проверяя его относительно последнего поворота в очереди.
+
+        Повторы, развороты и нажатия сверх TURN_QUEUE_SIZE отбрасываются.
+        """
+        push_turn(self.turns, self.direction, direction)
+
+    def check_collision(self):
+        """
+        Проверяет, столкнулась ли голова змейки с телом или со стеной.
+        """
+        body = self.snake.body
+        return body.head_collides() or body.head in self.wall_cells
+
+    def retreat(self, tail, direction, food=None, walls=None, wall_cells=None):
+        """
+        Отменяет последний шаг - действие, обратное advance.
+
+        tail - клетка хвоста, освобожденная на шаге (None, если змейка выросла),
+        direction - направление до шага, food - еда до шага, если шаг ее съел,
+        walls и wall_cells - стены до шага, если шаг их сменил.
+        """
+        body = self.snake.body
+        if tail is not None:
+            body.push_tail(*tail)
+        body.pop_head()
+        if food is not None:
+            if self.score % 100 == 0:
+                self.speed_multiplier -= 0.5
+            self.score -= 5
+            self.speed = int(self.base_speed / self.speed_multiplier)
+            self.food = food
+        if walls is not None:
+            for x, y in self.wall_cells:
+                self.free.unblock(y * self.width + x)
+            self.walls = walls
+            self.wall_cells = wall_cells
+            for x, y in wall_cells:
+                self.free.block(y * self.width + x)
+        self.direction = direction
+        self.turns.clear()
+        self.ticks -= 1
+        self.done = False
+
+    def step(self, action=None):
+        """
+        Выполняет один шаг игры. action - новое направление или None, чтобы взять поворот из очереди.
+        """
+        head, tail, ate, walls_changed = self.advance(action)
+        self.done = self.check_collision()
+        return StepResult(head, tail, ate, walls_changed, self.done)
+
+    def advance(self, action=None):
+        """
+        Двигает змейку и обрабатывает еду без проверки столкновений. action - как в step.
+
+        Возвращает новую голову, освобожденную клетку хвоста, съедена ли еда и сменились ли стены.
+        """
+        if action is not None:
+            self.turn(action)
+        elif self.turns:
+            self.turn(self.turns.popleft())
+        body = self.snake.body
+        head = body.cells[body.start]
+        new_x = (head % self.width + self.direction[0]) % self.width
+        new_y = (head // self.width + self.direction[1]) % self.height
+        body.push_head(new_x, new_y)
+        self.ticks += 1
+
+        tail = None
+        walls_changed = False
+        ate = new_x == self.food.x and new_y == self.food.y
+        if ate:
+            self.score += 5
+            if self.score % 100 == 0:
+                self.speed_multiplier += 0.5
+            self.speed = int(self.base_speed / self.speed_multiplier)
+            if self.walls_enabled and self.score >= 500 and self.score % 200 == 0:
+                self.update_walls()
+                walls_changed = True
+            self.food = self.spawn_food()
+        else:
+            tail = body.xy(body.pop_tail())
+        return (new_x, new_y), tail, ate, walls_changed
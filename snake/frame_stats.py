@@ -0,0 +1,114 @@
+"""
+Замеры времени кадров игрового цикла.
+
+Включаются по желанию: пока замеры выключены, игровой цикл их не вызывает.
+"""
+import csv
+import json
+from array import array
+from time import monotonic_ns, perf_counter_ns
+
+from .engine import StepResult
+
+COLUMNS = ("logic_ns", "collision_ns", "render_ns", "jitter_ns")
+
+
+class FrameStats:
+    """
+    Кольцевой буфер замеров последних capacity шагов.
+
+    Для каждого шага хранятся время логики (движение и еда), проверки
+    столкновений, отрисовки и дрожание - опоздание начала шага к сроку,
+    назначенному планировщиком. Без срока дрожанием считается отклонение
+    реального интервала между шагами от заданной скорости.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.columns = {name: array("q", bytes(8 * capacity)) for name in COLUMNS}
+        self.index = 0
+        self.count = 0
+        self.last_start = 0
+        self.last_delay = 0
+        self.render_start = 0
+
+    def timed_step(self, engine, action=None, deadline=None):
+        """
+        Выполняет шаг движка, замеряя логику и столкновения отдельно.
+
+        deadline - срок шага по monotonic() из TickScheduler.deadline. Шаги,
+        которые планировщик выполняет подряд, догоняя отставание, отсчитываются
+        каждый от своего срока, а не от начала предыдущего шага.
+        """
+        start = perf_counter_ns()
+        if deadline is not None:
+            jitter = monotonic_ns() - int(deadline * 1_000_000_000)
+        elif self.last_start:
+            jitter = start - self.last_start - self.last_delay * 1_000_000
+        else:
+            jitter = 0
+        self.last_start = start
+        head, tail, ate, walls_changed = engine.advance(action)
+        logic_end = perf_counter_ns()
+        engine.done = engine.check_collision()
+        collision_end = perf_counter_ns()
+
+        i = self.index
+        self.columns["logic_ns"][i] = logic_end - start
+        self.columns["collision_ns"][i] = collision_end - logic_end
+        self.columns["jitter_ns"][i] = jitter
+        self.columns["render_ns"][i] = 0
+        self.render_start = collision_end
+        return StepResult(head, tail, ate, walls_changed, engine.done)
+
+    def end_tick(self, delay):
+        """
+        Завершает замер шага после отрисовки. delay - задержка до следующего шага в мс.
+        """
+        self.columns["render_ns"][self.index] = perf_counter_ns() - self.render_start
+        self.last_delay = delay
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def reset_timing(self):
+        """
+        Забывает время последнего шага, чтобы пауза не попала в отклонение интервала.
+        """
+        self.last_start = 0
+
+    def rows(self):
+        """
+        Перебирает замеры от старых к новым.
+        """
+        first = (self.index - self.count) % self.capacity
+        for k in range(self.count):
+            i = (first + k) % self.capacity
+            yield tuple(self.columns[name][i] for name in COLUMNS)
+
+    def averages(self):
+        """
+        Возвращает средние значения столбцов в миллисекундах.
+        """
+        if not self.count:
+            return dict.fromkeys(COLUMNS, 0.0)
+        totals = [0] * len(COLUMNS)
+        for row in self.rows():
+            for k, value in enumerate(row):
+                totals[k] += value
+        return {name: total / self.count / 1_000_000 for name, total in zip(COLUMNS, totals)}
+
+    def summary(self):
+        averages = self.averages()
+        return (f"Логика: {averages['logic_ns']:.3f} мс\n"
+                f"Столкновения: {averages['collision_ns']:.3f} мс\n"
+                f"Отрисовка: {averages['render_ns']:.3f} мс\n"
+                f"Дрожание: {averages['jitter_ns']:.1f} мс")
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.rows())
+
+    def to_json(self, path):
+        with open(path, "w") as file:
+            json.dump([dict(zip(COLUMNS, row)) for row in self.rows()], file)
@@ -0,0 +1,343 @@
+import struct
+import time
+import tkinter as tk
+
+from .engine import DIRECTIONS, SnakeEngine
+from .highscores import HighScoreStore
+from .overlays import HighScoresWindow
+from .renderer import make_renderer, screen_size
+from .replay import Replay, new_seed
+from .rewind import Rewind
+from .scheduler import TickScheduler
+
+# На сколько секунд назад перематывает игру клавиша BackSpace
+REWIND_SECONDS = 3
+
+
+class Game:
+    """
+    Пользовательский интерфейс игры поверх SnakeEngine.
+
+    Автопилот (клавиша a), планировщик MCTS (клавиша m) и замеры кадров
+    загружаются при первом включении, чтобы не замедлять запуск окна.
+    F5 сохраняет снимок игры, F9 продолжает игру из него; при закрытии
+    окна незаконченная игра сохраняется в отдельный снимок, который
+    загружается клавишей F10. BackSpace перематывает
+    игру на REWIND_SECONDS секунд назад.
+    """
+    def __init__(self, width, height, cell=10, speed=100):
+        # Инициализируем окно игры и холст
+        self.root = tk.Tk()
+        self.root.title("Змейка")
+        self.root.resizable(False, False)
+        self.cell = cell
+        self.screen_width, self.screen_height = screen_size(width, height, cell)
+        self.canvas = tk.Canvas(self.root, width=self.screen_width, height=self.screen_height + 80,
+                                highlightthickness=0)
+        self.canvas.pack()
+        self.renderer = make_renderer(self.canvas, width, height, cell)
+
+        # Создаем игровой движок со змейкой и едой
+        self.engine = SnakeEngine(width, height, speed=speed)
+        self.replay = None
+        self.rewind = Rewind()
+        self.autopilot = None
+        self.autopilot_enabled = False
+        self.planner = None
+        self.planner_enabled = False
+        self.stats = None
+        self.scheduler = TickScheduler(self.root, self.play, lambda: self.engine.speed)
+
+        # Устанавливаем игровые переменные
+        self.width = width
+        self.height = height
+        self.paused = False
+        self.high_scores = HighScoreStore()
+        self.started_at = 0.0
+        self.high_scores_window = HighScoresWindow(self.root, self.top_scores)
+
+        # Создаем элементы интерфейса
+        self.score_label = tk.Label(self.root, text="Счет: 0", font=("Arial", 18))
+        self.score_label.place(x=10, y=self.screen_height + 20)
+        self.speed_label = tk.Label(self.root, text="Скорость: 1.0", font=("Arial", 18))
+        self.speed_label.place(x=self.screen_width - 170, y=self.screen_height + 20)
+        self.restart_button = tk.Button(self.root, text="Перезапуск", command=self.restart_game)
+        self.quit_button = tk.Button(self.root, text="Выход", command=self.quit)
+        self.start_button = tk.Button(self.root, text="Старт", command=self.start_game, font=("Arial", 18))
+        # Кнопка рекордов создается один раз и только показывается после каждой игры
+        self.high_scores_button = tk.Button(self.root, text="Рекорды", command=self.high_scores_window.show)
+        self.start_button.place(x=self.screen_width // 2 - 50, y=self.screen_height // 2 + 10)
+
+        # Создаем границу игры, разделитель и кнопки
+        self.renderer.reset()
+        self.create_restart_and_quit_buttons()
+
+    def quit(self):
+        """
+        Закрывает окно, сохраняя незаконченную игру в отдельный снимок автосохранения.
+
+        Окно закрывается, даже если снимок записать не удалось (например, каталог только для чтения).
+        """
+        try:
+            if self.engine.ticks and not self.engine.done:
+                from . import snapshot
+                snapshot.save(self.engine, snapshot.AUTOSAVE_PATH)
+        except (OSError, struct.error):
+            pass
+        finally:
+            self.root.destroy()
+
+    def save_snapshot(self):
+        from . import snapshot
+        try:
+            snapshot.save(self.engine)
+        except (OSError, struct.error):
+            pass
+
+    def load_snapshot(self, path=None):
+        """
+        Продолжает игру из снимка path (по умолчанию - сохраненного клавишей F5); игра встает на паузу.
+        """
+        from . import snapshot
+        try:
+            snapshot.load(path or snapshot.SNAPSHOT_PATH, engine=self.engine)
+        except (OSError, ValueError, struct.error):
+            return
+        # Восстановленную игру нельзя повторить по зерну, поэтому она не записывается
+        self.replay = None
+        self.rewind.clear()
+        self.started_at = time.monotonic()
+        self.start_button.place_forget()
+        self.high_scores_button.place_forget()
+        self.score_label.config(text=f"Счет: {self.engine.score}")
+        self.speed_label.config(text=f"Скорость: {self.engine.speed_multiplier:.1f}")
+        self.renderer.reset()
+        self.renderer.draw_body(self.engine.snake.body)
+        self.renderer.draw_food(self.engine.food)
+        self.renderer.draw_walls(self.engine.walls)
+        self.pause()
+
+    def rewind_game(self, seconds=REWIND_SECONDS):
+        """
+        Отменяет шаги за последние seconds секунд игры, сколько их есть в буфере перемотки.
+        """
+        engine = self.engine
+        if engine.done or not len(self.rewind):
+            return
+        elapsed = 0
+        walls_changed = False
+        while len(self.rewind) and elapsed < seconds * 1000:
+            elapsed += self.rewind.last_interval()
+            walls_changed |= self.rewind.undo(engine)
+            self.renderer.undraw_snake(engine.snake)
+        self.renderer.draw_food(engine.food)
+        if walls_changed:
+            self.renderer.draw_walls(engine.walls)
+        # После перемотки игра расходится с генератором по зерну, и ее запись уже не повторить
+        self.replay = None
+        self.score_label.config(text=f"Счет: {engine.score}")
+        self.speed_label.config(text=f"Скорость: {engine.speed_multiplier:.1f}")
+
+    def create_restart_and_quit_buttons(self):
+        """
+        Добавляет кнопки "Перезапуск" и "Выход" в окно игры.
+        """
+        self.restart_button.place(x=self.screen_width // 2 - 75, y=self.screen_height + 50)
+        self.quit_button.place(x=self.screen_width // 2 + 25, y=self.screen_height + 50)
+
+    def start_game(self):
+        self.start_button.place_forget()  # Скрываем кнопку старта
+        self.high_scores_button.place_forget()  # Скрываем кнопку рекордов
+        self.reset_game()
+        self.scheduler.start()
+
+    def reset_game(self):
+        """
+        Сбрасывает все игровые переменные и элементы.
+        """
+        self.scheduler.stop()
+        seed = new_seed()
+        self.engine.reset(seed)
+        self.replay = Replay(self.width, self.height, self.engine.walls_enabled, seed)
+        self.rewind.clear()
+        self.started_at = time.monotonic()
+        self.paused = False
+        self.score_label.config(text="Счет: 0")
+        self.speed_label.config(text="Скорость: 1.0")
+        if self.stats is not None:
+            self.stats.reset_timing()
+        self.renderer.reset()
+        self.renderer.draw_snake(self.engine.snake)
+        self.renderer.draw_food(self.engine.food)
+
+    def play(self):
+        """
+        Выполняет один шаг игры, включая движение змейки, сбор еды и обнаружение столкновений.
+        """
+        if not self.paused:
+            if self.planner_enabled:
+                action = self.planner.choose()
+            elif self.autopilot_enabled:
+                action = self.autopilot.choose()
+            else:
+                action = None
+            engine = self.engine
+            direction, food, walls, wall_cells = engine.direction, engine.food, engine.walls, engine.wall_cells
+            if self.stats is None:
+                result = self.engine.step(action)
+            else:
+                result = self.stats.timed_step(self.engine, action, self.scheduler.deadline)
+            if self.replay is not None:
+                self.replay.record(self.engine.direction)
+            if not result.done:
+                self.rewind.record(engine, result, direction, food, walls, wall_cells)
+
+            if result.ate:
+                self.score_label.config(text=f"Счет: {self.engine.score}")
+                self.speed_label.config(text=f"Скорость: {self.engine.speed_multiplier:.1f}")
+
+            # Проверяем на столкновения
+            if result.done:
+                self.scheduler.stop()
+                self.game_over()
+            else:
+                self.renderer.draw_snake(self.engine.snake)
+                self.renderer.draw_food(self.engine.food)
+                if self.stats is not None:
+                    self.stats.end_tick(self.engine.speed)
+                    self.draw_stats()
+
+    def draw_stats(self):
+        """
+        Выводит средние времена кадра поверх поля раз в 10 шагов.
+        """
+        if self.stats.index % 10 == 0:
+            self.canvas.delete("stats")
+            self.renderer.create_text(5, 5, text=self.stats.summary(), anchor="nw", font=("Arial", 10),
+                                      fill="blue", tags="stats")
+
+    def toggle_stats(self):
+        """
+        Включает или выключает замеры времени кадров вместе с их выводом на холст.
+        """
+        if self.stats is None:
+            from .frame_stats import FrameStats
+            self.stats = FrameStats()
+        else:
+            self.stats = None
+            self.canvas.delete("stats")
+
+    def game_over(self):
+        """
+        Обрабатывает сценарий окончания игры, включая обновление рекордов и отображение сообщения об окончании игры.
+        """
+        if self.replay is not None:
+            self.replay.finish(self.engine)
+            try:
+                self.replay.append_to()
+            except (OSError, struct.error):
+                pass
+        import sqlite3
+        try:
+            self.high_scores.add(self.engine.score, len(self.engine.snake.body), time.monotonic() - self.started_at,
+                                 self.engine.seed)
+        except (sqlite3.Error, OSError):
+            # Рекорд теряется, но игра заканчивается как обычно
+            pass
+        self.renderer.create_text(self.screen_width // 2, self.screen_height // 2 - 5, text="Игра окончена!",
+                                  font=("Arial", 24), fill="red")
+        self.show_high_scores_button()
+        self.start_button.place(x=self.screen_width // 2 - 50, y=self.screen_height // 2 + 10)  # Показываем кнопку старта
+
+    def top_scores(self, n):
+        """
+        Возвращает n лучших счетов или пустой список, если базу рекордов не прочитать.
+        """
+        import sqlite3
+        try:
+            return self.high_scores.top(n)
+        except (sqlite3.Error, OSError):
+            return []
+
+    def show_high_scores_button(self):
+        """
+        Показывает кнопку "Рекорды" в окне игры.
+        """
+        self.high_scores_button.place(x=self.screen_width // 2 - 35, y=self.screen_height // 2 + 60)
+
+    def pause(self):
+        """
+        Приостанавливает игру и отображает сообщение "Пауза".
+        """
+        self.paused = True
+        self.scheduler.stop()
+        self.canvas.delete("pause")
+        self.renderer.create_text(self.screen_width // 2, self.screen_height // 2 + 40, text="Пауза",
+                                  font=("Arial", 24), fill="red", tags="pause")
+        self.create_restart_and_quit_buttons()
+        self.high_scores_button.place_forget()
+
+    def restart_game(self):
+        """
+        Перезапускает игру, сбрасывая все игровые переменные и элементы.
+        """
+        self.reset_game()
+        self.start_button.place(x=self.screen_width // 2 - 50, y=self.screen_height // 2 + 30)  # Показываем кнопку старта
+        self.high_scores_button.place_forget()
+        self.create_restart_and_quit_buttons()
+
+    def key_press(self, event):
+        """
+        Обрабатывает нажатия клавиш пользователем, включая паузу/возобновление игры и изменение направления змейки.
+        """
+        if event.keysym == "space":
+            if self.paused:
+                self.paused = False
+                self.canvas.delete("pause")
+                if self.stats is not None:
+                    self.stats.reset_timing()
+                self.scheduler.start()
+                self.create_restart_and_quit_buttons()
+                self.high_scores_button.place_forget()
+            else:
+                self.paused = True
+                self.pause()
+        elif event.keysym == "F3":
+            self.toggle_stats()
+        elif event.keysym == "F4" and self.stats is not None:
+            self.stats.to_csv("frame_stats.csv")
+            self.stats.to_json("frame_stats.json")
+        elif event.keysym == "F5":
+            self.save_snapshot()
+        elif event.keysym == "F9":
+            self.load_snapshot()
+        elif event.keysym == "F10":
+            from .snapshot import AUTOSAVE_PATH
+            self.load_snapshot(AUTOSAVE_PATH)
+        elif event.keysym == "BackSpace":
+            self.rewind_game()
+        elif event.keysym == "a":
+            # Автопилот ведет змейку, пока его не выключат той же клавишей
+            if self.autopilot is None:
+                from .autopilot import Autopilot
+                self.autopilot = Autopilot(self.engine)
+            self.autopilot_enabled = not self.autopilot_enabled
+            self.planner_enabled = False
+        elif event.keysym == "m":
+            # Планировщик MCTS вместо автопилота; тратит на поиск половину интервала шага
+            if self.planner is None:
+                from .planner import Planner
+                self.planner = Planner(self.engine)
+            self.planner_enabled = not self.planner_enabled
+            self.autopilot_enabled = False
+        elif not self.paused and event.keysym in DIRECTIONS:
+            self.engine.queue_turn(DIRECTIONS[event.keysym])
+
+    def run(self):
+        """
+        Запускает игру и входит в основной цикл событий.
+        """
+        self.root.bind("<Key>", self.key_press)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+        self.root.mainloop()
+
@@ -0,0 +1,76 @@
+import time
+
+from .paths import data_path, ensure_parent
+
+# Имя файла базы в каталоге данных игры (paths.py)
+HIGH_SCORES_FILE = "high_scores.db"
+
+
+class HighScoreStore:
+    """
+    Таблица рекордов в базе SQLite в режиме WAL.
+
+    Каждая законченная игра дописывается одной строкой (счет, длина змейки,
+    длительность, зерно, время окончания). Лучшие результаты берутся по
+    индексу на счете, без сортировки всей истории. База открывается при
+    первом обращении, поэтому создание хранилища ничего не стоит, а
+    модуль sqlite3 загружается только тогда.
+
+    По умолчанию база лежит в каталоге данных пользователя. Если базу не
+    открыть или не записать, методы выбрасывают sqlite3.Error или OSError.
+    """
+    def __init__(self, path=None):
+        self.path = path if path is not None else data_path(HIGH_SCORES_FILE)
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            import sqlite3
+            ensure_parent(self.path)
+            connection = sqlite3.connect(self.path)
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                # В режиме WAL fsync выполняется при контрольных точках, а не на каждой записи
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS games ("
+                    "id INTEGER PRIMARY KEY, score INTEGER NOT NULL, length INTEGER NOT NULL, "
+                    "duration REAL NOT NULL, seed INTEGER, timestamp REAL NOT NULL)")
+                connection.execute("CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC)")
+            except sqlite3.Error:
+                # Недонастроенное соединение не сохраняется: следующее обращение попробует снова
+                connection.close()
+                raise
+            self.connection = connection
+        return self.connection
+
+    def add(self, score, length, duration, seed, timestamp=None):
+        """
+        Записывает результат законченной игры.
+        """
+        connection = self.connect()
+        with connection:
+            connection.execute(
+                "INSERT INTO games (score, length, duration, seed, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (score, length, duration, seed, time.time() if timestamp is None else timestamp))
+
+    def add_many(self, records):
+        """
+        Записывает несколько результатов одной транзакцией.
+        """
+        connection = self.connect()
+        with connection:
+            connection.executemany(
+                "INSERT INTO games (score, length, duration, seed, timestamp) VALUES (?, ?, ?, ?, ?)", records)
+
+    def top(self, n=3):
+        """
+        Возвращает n лучших счетов по убыванию.
+        """
+        rows = self.connect().execute("SELECT score FROM games ORDER BY score DESC LIMIT ?", (n,))
+        return [score for score, in rows]
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,148 @@
+"""
+Наблюдения для агентов поверх SnakeEngine.
+
+Observer держит заранее выделенный стек плоскостей uint8 размером
+(каналы, высота, ширина) и обновляет в нем только клетки, изменившиеся за
+шаг: новую голову, освобожденный хвост, еду и стены, если они сменились.
+Наружу отдаются представления NumPy только для чтения, поэтому наблюдение
+не копируется и не создается заново на каждом шаге.
+
+Лучи - расстояния от головы до ближайших стены, части тела и еды по
+восьми направлениям. Клетки лучей считаются в заранее выделенных
+массивах индексов и читаются прямо из плоскостей, без обхода тела.
+"""
+import numpy as np
+
+BODY, HEAD, FOOD, WALLS = range(4)
+# Плоскости направлений: через клетку тела змейка ушла вверх, вниз, влево или вправо
+DIRECTION_PLANES = {(0, -1): 4, (0, 1): 5, (-1, 0): 6, (1, 0): 7}
+# Восемь направлений лучей: по часовой стрелке, начиная с верха
+RAYS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+RAY_TARGETS = (WALLS, BODY, FOOD)
+
+
+class Observer:
+    """
+    Плоскости и лучи для одного SnakeEngine.
+
+    После каждого engine.step() нужно вызвать update() с его результатом,
+    а после engine.reset() - reset(). planes - стек плоскостей BODY, HEAD,
+    FOOD, WALLS (и четыре плоскости направлений, если directions), rays -
+    массив (8, 3) обратных расстояний до стены, тела и еды по RAYS,
+    0 - если луч ничего не встретил.
+    """
+    def __init__(self, engine, directions=False):
+        self.engine = engine
+        self.directions = directions
+        width, height = engine.width, engine.height
+        self.planes_data = np.zeros((8 if directions else 4, height, width), dtype=np.uint8)
+        self.flat = self.planes_data.reshape(len(self.planes_data), -1)
+        self.planes = self.planes_data.view()
+        self.planes.flags.writeable = False
+
+        # Смещения клеток вдоль каждого луча; луч не длиннее, чем нужно, чтобы вернуться к голове
+        steps = np.arange(1, max(width, height))
+        self.ray_dx = np.array([dx for dx, dy in RAYS])[:, None] * steps
+        self.ray_dy = np.array([dy for dx, dy in RAYS])[:, None] * steps
+        limits = np.array([width - 1 if dy == 0 else height - 1 if dx == 0 else min(width, height) - 1
+                           for dx, dy in RAYS])
+        self.ray_valid = (steps[None, :] <= limits[:, None]).astype(np.uint8)
+        self.ray_x = np.empty(self.ray_dx.shape, dtype=np.int64)
+        self.ray_y = np.empty(self.ray_dx.shape, dtype=np.int64)
+        self.ray_cells = np.empty(self.ray_dx.shape, dtype=np.int64)
+        self.ray_hits = np.empty((len(RAY_TARGETS),) + self.ray_dx.shape, dtype=np.uint8)
+        self.ray_first = np.empty(self.ray_hits.shape[:2], dtype=np.intp)
+        self.ray_found = np.empty(self.ray_hits.shape[:2], dtype=np.uint8)
+        self.rays_data = np.zeros((len(RAYS), len(RAY_TARGETS)), dtype=np.float32)
+        self.rays = self.rays_data.view()
+        self.rays.flags.writeable = False
+
+        self.head_cell = None
+        self.food_cell = None
+        self.reset()
+
+    def reset(self):
+        """
+        Заполняет плоскости заново по состоянию движка.
+        """
+        engine = self.engine
+        self.planes_data[:] = 0
+        body = engine.snake.body
+        previous = None
+        for x, y in body:
+            cell = y * engine.width + x
+            self.flat[BODY, cell] += 1
+            if self.directions and previous is not None:
+                # Тело перебирается от головы к хвосту, поэтому из этой клетки змейка ушла в previous
+                self.flat[DIRECTION_PLANES[self.step_direction(cell, previous)], cell] = 1
+            previous = cell
+        self.head_cell = body.head_cell
+        self.flat[HEAD, self.head_cell] = 1
+        self.set_walls()
+        self.set_food()
+        self.cast_rays()
+
+    def step_direction(self, a, b):
+        width, height = self.engine.width, self.engine.height
+        return (b % width - a % width + 1) % width - 1, (b // width - a // width + 1) % height - 1
+
+    def set_food(self):
+        food = self.engine.food
+        if self.food_cell is not None:
+            self.flat[FOOD, self.food_cell] = 0
+        self.food_cell = food.y * self.engine.width + food.x
+        self.flat[FOOD, self.food_cell] = 1
+
+    def set_walls(self):
+        walls = self.flat[WALLS]
+        walls[:] = 0
+        for wall in self.engine.walls:
+            walls[wall.y * self.engine.width + wall.x] = 1
+
+    def update(self, result):
+        """
+        Переносит в плоскости изменения за шаг. result - StepResult из engine.step().
+        """
+        width = self.engine.width
+        flat = self.flat
+        (x, y), tail = result.head, result.tail
+        head = y * width + x
+        if self.directions:
+            # Отмечаем до снятия хвоста: у змейки из одной клетки бывшая голова и есть хвост
+            flat[DIRECTION_PLANES[self.engine.direction], self.head_cell] = 1
+        if tail is not None:
+            cell = tail[1] * width + tail[0]
+            flat[BODY, cell] -= 1
+            if self.directions:
+                flat[4:, cell] = 0
+        flat[BODY, head] += 1
+        flat[HEAD, self.head_cell] = 0
+        flat[HEAD, head] = 1
+        self.head_cell = head
+        if result.walls_changed:
+            self.set_walls()
+        if result.ate:
+            self.set_food()
+        self.cast_rays()
+
+    def cast_rays(self):
+        """
+        Считает обратные расстояния по восьми лучам из головы.
+        """
+        width, height = self.engine.width, self.engine.height
+        np.add(self.ray_dx, self.head_cell % width, out=self.ray_x)
+        np.remainder(self.ray_x, width, out=self.ray_x)
+        np.add(self.ray_dy, self.head_cell // width, out=self.ray_y)
+        np.remainder(self.ray_y, height, out=self.ray_y)
+        np.multiply(self.ray_y, width, out=self.ray_cells)
+        np.add(self.ray_cells, self.ray_x, out=self.ray_cells)
+        for k, plane in enumerate(RAY_TARGETS):
+            hits = self.ray_hits[k]
+            np.take(self.flat[plane], self.ray_cells, out=hits)
+            np.minimum(hits, 1, out=hits)
+            np.multiply(hits, self.ray_valid, out=hits)
+        np.argmax(self.ray_hits, axis=2, out=self.ray_first)
+        np.max(self.ray_hits, axis=2, out=self.ray_found)
+        # Расстояние до первой отмеченной клетки на луче - ее номер плюс один
+        np.add(self.ray_first, 1, out=self.ray_first)
+        np.divide(self.ray_found, self.ray_first, out=self.rays_data.T, casting="unsafe")
@@ -0,0 +1,51 @@
+"""
+Окна и надписи поверх игры, которые создаются один раз и переиспользуются.
+
+Игра может идти сутками, поэтому каждый показ не должен создавать новые
+виджеты Tk: они копятся, пока окно игры открыто, даже если их спрятать.
+"""
+import tkinter as tk
+
+
+class HighScoresWindow:
+    """
+    Окно рекордов.
+
+    Окно создается при первом показе, а дальше только обновляет список и
+    снова появляется. Закрытие окна прячет его (withdraw), не уничтожая.
+    top(n) - функция, возвращающая n лучших счетов.
+    """
+    def __init__(self, root, top, count=3):
+        self.root = root
+        self.top = top
+        self.count = count
+        self.window = None
+        self.label = None
+        self.listbox = None
+
+    def create(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("Рекорды")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        self.label = tk.Label(self.window, text="Рекорды:", font=("Arial", 18))
+        self.label.pack(pady=10)
+        self.listbox = tk.Listbox(self.window, width=20, height=self.count, font=("Arial", 16))
+        self.listbox.pack(pady=10)
+
+    def show(self):
+        """
+        Показывает окно с текущими рекордами.
+        """
+        if self.window is None or not self.window.winfo_exists():
+            self.create()
+        else:
+            self.window.deiconify()
+            self.window.lift()
+        self.listbox.delete(0, tk.END)
+        for i, score in enumerate(self.top(self.count), start=1):
+            self.listbox.insert(tk.END, f"{i}. {score}")
+
+    def hide(self):
+        if self.window is not None:
+            self.window.withdraw()
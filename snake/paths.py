@@ -0,0 +1,47 @@
+"""
+Каталог данных игры: рекорды и записи игр.
+
+Данные лежат в каталоге пользователя, а не в текущем каталоге, из
+которого запустили игру (он может быть только для чтения или общим для
+нескольких пользователей): %APPDATA%\\snake в Windows,
+~/Library/Application Support/snake в macOS, $XDG_DATA_HOME/snake
+(по умолчанию ~/.local/share/snake) в остальных системах. Переменная
+окружения SNAKE_DATA_DIR задает каталог явно, например для замеров.
+Каталог создается при первой записи, а не при импорте.
+"""
+import os
+import sys
+
+DATA_DIR_VARIABLE = "SNAKE_DATA_DIR"
+
+
+def data_dir():
+    """
+    Возвращает каталог данных игры для текущего пользователя.
+    """
+    directory = os.environ.get(DATA_DIR_VARIABLE)
+    if directory:
+        return directory
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "snake")
+
+
+def data_path(name):
+    """
+    Возвращает путь к файлу name в каталоге данных игры.
+    """
+    return os.path.join(data_dir(), name)
+
+
+def ensure_parent(path):
+    """
+    Создает каталог файла path, если его еще нет.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
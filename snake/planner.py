@@ -0,0 +1,267 @@
+"""
+Планировщик ходов поиском по дереву Монте-Карло (MCTS).
+
+Каждая симуляция копирует игру через SnakeEngine.clone() со своим
+генератором случайных чисел, спускается по дереву, выбирая ходы по UCT,
+а дальше доигрывает случайными безопасными ходами до горизонта. Еда в
+копиях появляется случайно, поэтому оценка ходов учитывает разные места
+появления еды и стены, которые движок ставит после 500 очков.
+
+Узлы дерева лежат в таблице транспозиций по хешу Зобриста позиции:
+одинаковые позиции, достигнутые разными путями, делят один узел, а
+таблица между ходами сохраняется. Хеш обновляется за O(1) по итогу
+шага. Таблица ограничена capacity узлами, при переполнении вытесняются
+давно не использованные.
+
+На ход отводится доля budget интервала шага engine.speed.
+"""
+import math
+import random
+import time
+from collections import OrderedDict
+
+from .autopilot import neighbor_table
+from .engine import MOVES
+
+# Награды: съеденная еда и гибель змейки
+EAT_REWARD = 1.0
+DEATH_REWARD = -5.0
+# Доля интервала шага, которую планировщик тратит на поиск
+BUDGET = 0.5
+# Сколько узлов хранит таблица транспозиций
+CAPACITY = 50000
+
+
+class Zobrist:
+    """
+    Случайные 64-битные ключи для хеширования позиций поля.
+
+    Хеш позиции - исключающее ИЛИ ключей клеток тела, головы, еды и стен
+    и ключа направления. Порядок частей тела в хеш не входит.
+    """
+    def __init__(self, width, height, seed=0):
+        rng = random.Random(seed)
+        count = width * height
+        self.width = width
+        self.body = [rng.getrandbits(64) for _ in range(count)]
+        self.head = [rng.getrandbits(64) for _ in range(count)]
+        self.food = [rng.getrandbits(64) for _ in range(count)]
+        self.wall = [rng.getrandbits(64) for _ in range(count)]
+        self.direction = {direction: rng.getrandbits(64) for direction in MOVES}
+
+    def walls_key(self, engine):
+        key = 0
+        for x, y in engine.wall_cells:
+            key ^= self.wall[y * self.width + x]
+        return key
+
+    def key(self, engine):
+        """
+        Считает хеш позиции целиком.
+        """
+        body = engine.snake.body
+        key = self.head[body.head_cell] ^ self.direction[engine.direction]
+        key ^= self.food[engine.food.y * self.width + engine.food.x]
+        for i in range(body.length):
+            key ^= self.body[body.cells[(body.start + i) % body.capacity]]
+        return key ^ self.walls_key(engine)
+
+    def step(self, engine, key, action):
+        """
+        Делает шаг движка и возвращает итог шага и новый хеш.
+        """
+        body = engine.snake.body
+        head = body.head_cell
+        food = engine.food.y * self.width + engine.food.x
+        direction = engine.direction
+        walls = self.walls_key(engine) if engine.walls_enabled else 0
+        result = engine.step(action)
+        x, y = result.head
+        cell = y * self.width + x
+        key ^= self.head[head] ^ self.head[cell] ^ self.body[cell]
+        key ^= self.direction[direction] ^ self.direction[engine.direction]
+        if result.tail is not None:
+            key ^= self.body[result.tail[1] * self.width + result.tail[0]]
+        if result.ate:
+            key ^= self.food[food] ^ self.food[engine.food.y * self.width + engine.food.x]
+        if result.walls_changed:
+            key ^= walls ^ self.walls_key(engine)
+        return result, key
+
+
+class Node:
+    """
+    Узел дерева: допустимые ходы, число посещений и сумма наград по каждому ходу.
+    """
+    __slots__ = ("actions", "visits", "counts", "values")
+
+    def __init__(self, actions):
+        self.actions = actions
+        self.visits = 0
+        self.counts = [0] * len(actions)
+        self.values = [0.0] * len(actions)
+
+
+class TranspositionTable:
+    """
+    Узлы по хешу позиции с вытеснением давно не использованных.
+    """
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.nodes = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get(self, key):
+        node = self.nodes.get(key)
+        if node is not None:
+            self.nodes.move_to_end(key)
+        return node
+
+    def put(self, key, node):
+        self.nodes[key] = node
+        if len(self.nodes) > self.capacity:
+            self.nodes.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.nodes.clear()
+
+
+class Planner:
+    """
+    Выбирает направление для SnakeEngine поиском MCTS.
+
+    Интерфейс тот же, что у Autopilot: choose() возвращает направление
+    для следующего шага. horizon - сколько шагов вперед смотрит симуляция,
+    discount - множитель награды за каждый следующий шаг.
+    """
+    def __init__(self, engine, budget=BUDGET, capacity=CAPACITY, horizon=30, discount=0.95,
+                 exploration=1.0, seed=None):
+        self.engine = engine
+        self.budget = budget
+        self.horizon = horizon
+        self.discount = discount
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.table = TranspositionTable(capacity)
+        self.board = None
+        self.zobrist = None
+        self.neighbors = None
+        self.simulations = 0
+
+    def prepare(self):
+        """
+        Строит ключи Зобриста и таблицу соседей для текущего размера поля.
+        """
+        board = (self.engine.width, self.engine.height)
+        if board != self.board:
+            self.board = board
+            self.zobrist = Zobrist(*board)
+            self.neighbors = neighbor_table(*board)
+            self.table.clear()
+
+    def legal_actions(self, engine):
+        """
+        Возвращает ходы без разворота назад.
+        """
+        dx, dy = engine.direction
+        return [direction for direction in MOVES if direction != (-dx, -dy)]
+
+    def choose(self, simulations=None):
+        """
+        Возвращает направление для следующего шага.
+
+        Поиск идет, пока не истечет доля budget интервала шага, или ровно
+        simulations симуляций, если число задано.
+        """
+        self.prepare()
+        engine = self.engine
+        root = self.zobrist.key(engine)
+        deadline = time.perf_counter() + engine.speed * self.budget / 1000
+        count = 0
+        while True:
+            self.simulate(root)
+            count += 1
+            if count == simulations or simulations is None and time.perf_counter() >= deadline:
+                break
+        self.simulations += count
+        node = self.table.get(root)
+        best = max(range(len(node.actions)), key=lambda k: (node.counts[k], node.values[k]))
+        return node.actions[best]
+
+    def select(self, node):
+        """
+        Выбирает ход узла по UCT; непробованные ходы идут первыми.
+        """
+        log_visits = math.log(node.visits + 1)
+        best = 0
+        best_score = -math.inf
+        for k, count in enumerate(node.counts):
+            if count == 0:
+                return k
+            score = node.values[k] / count + self.exploration * math.sqrt(log_visits / count)
+            if score > best_score:
+                best, best_score = k, score
+        return best
+
+    def simulate(self, root):
+        """
+        Одна симуляция: спуск по дереву, добавление узла, случайное доигрывание и обновление наград.
+        """
+        state = self.engine.clone(self.rng)
+        key = root
+        path = []
+        rewards = []
+        depth = 0
+        while depth < self.horizon:
+            node = self.table.get(key)
+            if node is None:
+                self.table.put(key, Node(self.legal_actions(state)))
+                rewards.append(self.rollout(state, self.horizon - depth))
+                break
+            k = self.select(node)
+            path.append((node, k))
+            result, key = self.zobrist.step(state, key, node.actions[k])
+            depth += 1
+            if result.done:
+                rewards.append(DEATH_REWARD)
+                break
+            rewards.append(EAT_REWARD if result.ate else 0.0)
+
+        # Награда хода - его немедленная награда плюс дисконтированная награда продолжения
+        total = rewards[-1] if len(rewards) > len(path) else 0.0
+        for (node, k), reward in zip(reversed(path), reversed(rewards[:len(path)])):
+            total = reward + self.discount * total
+            node.visits += 1
+            node.counts[k] += 1
+            node.values[k] += total
+
+    def rollout(self, state, steps):
+        """
+        Доигрывает случайными ходами, не ведущими в занятую клетку или стену, и возвращает дисконтированную награду.
+        """
+        neighbors = self.neighbors
+        rng = self.rng
+        body = state.snake.body
+        occupancy = body.occupancy
+        walls = {y * state.width + x for x, y in state.wall_cells}
+        total = 0.0
+        weight = 1.0
+        for _ in range(steps):
+            head = body.head_cell
+            dx, dy = state.direction
+            options = []
+            for k, direction in enumerate(MOVES):
+                cell = neighbors[4 * head + k]
+                if direction != (-dx, -dy) and cell not in walls and (occupancy[cell] == 0 or cell == body.tail_cell):
+                    options.append(direction)
+            result = state.step(rng.choice(options) if options else None)
+            if result.done:
+                return total + weight * DEATH_REWARD
+            if result.ate:
+                total += weight * EAT_REWARD
+            weight *= self.discount
+        return total
@@ -0,0 +1,172 @@
+"""
+Сетевой протокол арены.
+
+Кадр - длина (4 байта) и содержимое, первый байт которого - тип кадра:
+
+- b"S", снимок: номер шага, ширина, высота, номер змейки получателя,
+  число мест для змеек, затем для каждого места длина тела и его клетки
+  от головы к хвосту, затем число кусков еды и их клетки. Отправляется
+  один раз, при подключении.
+- b"D", изменения за шаг: номера ушедших змеек, появившиеся змейки
+  (номер, клетка), по байту хода на каждое место, номера погибших змеек
+  и замены еды (старая клетка, новая клетка или NO_CELL).
+
+Байт хода - номер направления в MOVES и бит роста (змейка съела еду и
+хвост остался на месте), NO_MOVE - змейки на этом месте нет. Новая
+голова и освобожденный хвост получаются из тела, которое клиент ведет
+сам, поэтому ход змейки стоит один байт. Кадр изменений один для всех
+клиентов и кодируется один раз за шаг.
+
+Клиент отправляет серверу по байту на нажатие - номер направления в MOVES.
+"""
+import struct
+from collections import deque
+
+from .arena import ArenaStep
+from .engine import MOVES
+
+FRAME = struct.Struct("<I")
+SNAPSHOT = struct.Struct("<cIHHHH")
+DELTA = struct.Struct("<cIHHHHI")
+SPAWN = struct.Struct("<HI")
+FOOD = struct.Struct("<II")
+NO_CELL = 0xFFFFFFFF
+NO_MOVE = 0xFF
+GROW = 4
+CODES = {direction: code for code, direction in enumerate(MOVES)}
+
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+
+def encode_snapshot(engine, tick, you):
+    """
+    Кодирует полное состояние арены для нового клиента.
+    """
+    out = bytearray(SNAPSHOT.pack(b"S", tick, engine.width, engine.height, you, len(engine.snakes)))
+    for snake in engine.snakes:
+        body = snake.body
+        cells = [body.cells[(body.start + i) % body.capacity] for i in range(body.length)]
+        out += struct.pack(f"<I{len(cells)}I", len(cells), *cells)
+    out += struct.pack(f"<I{len(engine.food)}I", len(engine.food), *engine.food)
+    return frame(bytes(out))
+
+
+def encode_delta(engine, tick, left, spawned, result):
+    """
+    Кодирует изменения за шаг. left - номера змеек, убранных перед шагом,
+    spawned - змейки, появившиеся перед шагом или в его начале.
+    """
+    width = engine.width
+    moves = bytearray([NO_MOVE]) * len(engine.snakes)
+    for index, head, tail in result.moves:
+        moves[index] = CODES[engine.snakes[index].direction] | (GROW if tail is None else 0)
+    out = bytearray(DELTA.pack(b"D", tick, len(left), len(spawned), len(moves), len(result.died),
+                               len(result.food)))
+    out += struct.pack(f"<{len(left)}H", *left)
+    for index, (x, y) in spawned:
+        out += SPAWN.pack(index, y * width + x)
+    out += moves
+    out += struct.pack(f"<{len(result.died)}H", *result.died)
+    for (x, y), new in result.food:
+        out += FOOD.pack(y * width + x, NO_CELL if new is None else new[1] * width + new[0])
+    return frame(bytes(out))
+
+
+def read_frames(buffer):
+    """
+    Извлекает из начала буфера все целые кадры и возвращает их содержимое.
+    """
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= FRAME.size:
+        size, = FRAME.unpack_from(buffer, offset)
+        if len(buffer) - offset - FRAME.size < size:
+            break
+        offset += FRAME.size
+        frames.append(bytes(buffer[offset:offset + size]))
+        offset += size
+    del buffer[:offset]
+    return frames
+
+
+class ArenaMirror:
+    """
+    Копия арены на клиенте: тела змеек по клеткам и еда.
+
+    Превращает кадры сервера в ArenaStep с координатами, как у локального
+    ArenaEngine, чтобы их можно было нарисовать тем же ArenaView.
+    """
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.you = 0
+        self.tick = 0
+        self.bodies = []
+        self.food = set()
+
+    def xy(self, cell):
+        return cell % self.width, cell // self.width
+
+    def load_snapshot(self, payload):
+        _, self.tick, self.width, self.height, self.you, slots = SNAPSHOT.unpack_from(payload)
+        offset = SNAPSHOT.size
+        self.bodies = []
+        for _ in range(slots):
+            length, = struct.unpack_from("<I", payload, offset)
+            offset += 4
+            self.bodies.append(deque(struct.unpack_from(f"<{length}I", payload, offset)))
+            offset += 4 * length
+        count, = struct.unpack_from("<I", payload, offset)
+        self.food = set(struct.unpack_from(f"<{count}I", payload, offset + 4))
+
+    def decode_delta(self, payload):
+        """
+        Применяет кадр изменений и возвращает ушедших змеек и ArenaStep.
+        """
+        _, self.tick, left_count, spawned_count, slots, died_count, food_count = DELTA.unpack_from(payload)
+        offset = DELTA.size
+        left = struct.unpack_from(f"<{left_count}H", payload, offset)
+        offset += 2 * left_count
+        for index in left:
+            self.bodies[index].clear()
+        while len(self.bodies) < slots:
+            self.bodies.append(deque())
+
+        spawned = []
+        for _ in range(spawned_count):
+            index, cell = SPAWN.unpack_from(payload, offset)
+            offset += SPAWN.size
+            self.bodies[index] = deque([cell])
+            spawned.append((index, self.xy(cell)))
+
+        moves = []
+        width, height = self.width, self.height
+        for index, code in enumerate(payload[offset:offset + slots]):
+            if code == NO_MOVE:
+                continue
+            body = self.bodies[index]
+            dx, dy = MOVES[code & 3]
+            head = body[0]
+            x = (head % width + dx) % width
+            y = (head // width + dy) % height
+            body.appendleft(y * width + x)
+            tail = None if code & GROW else self.xy(body.pop())
+            moves.append((index, (x, y), tail))
+        offset += slots
+
+        died = struct.unpack_from(f"<{died_count}H", payload, offset)
+        offset += 2 * died_count
+        for index in died:
+            self.bodies[index].clear()
+
+        food = []
+        for _ in range(food_count):
+            old, new = FOOD.unpack_from(payload, offset)
+            offset += FOOD.size
+            self.food.discard(old)
+            if new != NO_CELL:
+                self.food.add(new)
+            food.append((self.xy(old), None if new == NO_CELL else self.xy(new)))
+        return left, ArenaStep(moves, list(died), spawned, food)
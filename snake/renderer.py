@@ -0,0 +1,486 @@
+from collections import deque
+
+from .sprites import get_sprites
+
+# Наибольший размер игрового поля на экране в пикселях
+MAX_SCREEN = 800
+# Начиная с такого числа клеток поля тело рисуется ломаными, а не кругом на клетку
+POLYLINE_CELLS = 100 * 100
+# Наибольшее число вершин в одной ломаной тела
+MAX_VERTICES = 64
+
+
+def screen_size(width, height, cell):
+    """
+    Возвращает размер видимой части поля в пикселях.
+    """
+    return min(width, MAX_SCREEN // cell) * cell, min(height, MAX_SCREEN // cell) * cell
+
+
+def make_renderer(canvas, width, height, cell=10):
+    """
+    Выбирает способ отрисовки по размеру поля.
+    """
+    renderer_class = PolylineRenderer if width * height >= POLYLINE_CELLS else SpriteRenderer
+    return renderer_class(canvas, width, height, cell)
+
+
+class Renderer:
+    """
+    Рисует игру на холсте, сохраняя элементы холста между кадрами.
+
+    Граница, разделитель и стены рисуются один раз, а на каждом шаге
+    перемещаются только элементы головы, хвоста и еды.
+
+    Если поле не помещается на экран, холст показывает окно вокруг головы
+    и прокручивается, когда голова подходит к краю окна. Элементы с тегом
+    "fixed" (разделитель и надписи) при прокрутке остаются на месте экрана.
+    """
+    def __init__(self, canvas, width, height, cell=10):
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.screen_width, self.screen_height = screen_size(width, height, cell)
+        self.view_width = self.screen_width // cell
+        self.view_height = self.screen_height // cell
+        self.origin_x = 0
+        self.origin_y = 0
+        self.snake_items = deque()
+        self.food_item = None
+        self.food_position = None
+
+    def cell_box(self, x, y):
+        """
+        Возвращает координаты клетки поля на холсте.
+        """
+        cell = self.cell
+        return x * cell, y * cell, (x + 1) * cell, (y + 1) * cell
+
+    def reset(self):
+        """
+        Очищает холст и заново рисует статичные элементы.
+        """
+        self.canvas.delete("all")
+        self.snake_items.clear()
+        self.food_item = None
+        self.food_position = None
+        self.origin_x = 0
+        self.origin_y = 0
+        if self.view_width < self.width or self.view_height < self.height:
+            self.canvas.configure(scrollregion=(0, 0, self.width * self.cell, self.height * self.cell + 80))
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+        self.create_border()
+        self.create_separator()
+
+    def create_border(self):
+        """
+        Рисует границу игры на холсте.
+        """
+        self.canvas.create_rectangle(0, 0, self.width * self.cell, self.height * self.cell, outline="gray")
+
+    def create_separator(self):
+        """
+        Рисует разделительную линию между игровой областью и элементами интерфейса.
+        """
+        self.canvas.create_line(0, self.screen_height, self.screen_width, self.screen_height, fill="gray", width=2,
+                                tags="fixed")
+
+    def create_text(self, x, y, tags=None, **options):
+        """
+        Пишет текст в точке экрана (x, y), которая не сдвигается при прокрутке поля.
+        """
+        x += self.origin_x * self.cell
+        y += self.origin_y * self.cell
+        return self.canvas.create_text(x, y, tags=("fixed", tags) if tags else "fixed", **options)
+
+    def follow(self, x, y):
+        """
+        Прокручивает окно, если голова подошла к его краю ближе чем на четверть окна.
+        """
+        origin_x = self.scroll(x, self.origin_x, self.view_width, self.width)
+        origin_y = self.scroll(y, self.origin_y, self.view_height, self.height)
+        if origin_x != self.origin_x or origin_y != self.origin_y:
+            self.canvas.move("fixed", (origin_x - self.origin_x) * self.cell, (origin_y - self.origin_y) * self.cell)
+            self.origin_x = origin_x
+            self.origin_y = origin_y
+            self.canvas.xview_moveto(origin_x / self.width)
+            self.canvas.yview_moveto(origin_y * self.cell / (self.height * self.cell + 80))
+
+    def scroll(self, position, origin, view, size):
+        if view >= size:
+            return 0
+        margin = view // 4
+        if origin + margin <= position < origin + view - margin:
+            return origin
+        return min(max(position - view // 2, 0), size - view)
+
+    def draw_snake(self, snake):
+        """
+        Переносит элемент хвоста на место новой головы или создает новый, если змейка выросла.
+        """
+        x, y = snake.body.head
+        if len(self.snake_items) < len(snake.body):
+            item = self.canvas.create_oval(*self.cell_box(x, y), fill="green")
+        else:
+            item = self.snake_items.pop()
+            self.canvas.coords(item, *self.cell_box(x, y))
+        self.snake_items.appendleft(item)
+        self.follow(x, y)
+
+    def undraw_snake(self, snake):
+        """
+        Возвращает рисунок змейки на шаг назад после SnakeEngine.retreat:
+        элемент головы переносится на восстановленный хвост или удаляется, если змейка укоротилась.
+        """
+        body = snake.body
+        item = self.snake_items.popleft()
+        if len(self.snake_items) < len(body):
+            self.canvas.coords(item, *self.cell_box(*body.tail))
+            self.snake_items.append(item)
+        else:
+            self.canvas.delete(item)
+        self.follow(*body.head)
+
+    def draw_body(self, body):
+        """
+        Рисует змейку целиком заново, например после загрузки состояния.
+        """
+        for item in self.snake_items:
+            self.canvas.delete(item)
+        self.snake_items.clear()
+        for x, y in body:
+            self.snake_items.append(self.canvas.create_oval(*self.cell_box(x, y), fill="green"))
+        if len(body):
+            self.follow(*body.head)
+
+    def draw_food(self, food):
+        """
+        Перемещает элемент еды, если она сменила позицию.
+        """
+        position = (food.x, food.y)
+        if self.food_item is None:
+            self.food_item = self.canvas.create_oval(*self.cell_box(food.x, food.y), fill="red")
+        elif position != self.food_position:
+            self.canvas.coords(self.food_item, *self.cell_box(food.x, food.y))
+        self.food_position = position
+
+    def draw_walls(self, walls):
+        """
+        Перерисовывает стены. Вызывается только при их изменении.
+        """
+        self.canvas.delete("wall")
+        for wall in walls:
+            self.canvas.create_rectangle(*self.cell_box(wall.x, wall.y), fill="gray", tags="wall")
+
+
+class SpriteRenderer(Renderer):
+    """
+    Рисует змейку, еду и стены готовыми изображениями из sprites.
+
+    Каждая клетка тела - элемент-картинка. На шаге элемент хвоста
+    переносится на место головы (coords), а картинки меняются только у
+    новой головы, бывшей головы и нового хвоста (itemconfig), так что
+    стоимость шага не зависит от длины змейки.
+    """
+    def __init__(self, canvas, width, height, cell=10, theme="classic"):
+        super().__init__(canvas, width, height, cell)
+        self.theme = theme
+        self.sprites = None
+        self.last_head = None
+
+    def reset(self):
+        super().reset()
+        self.sprites = get_sprites(self.canvas, self.cell, self.theme)
+        self.last_head = None
+
+    def direction(self, a, b):
+        """
+        Направление хода из клетки a в соседнюю клетку b с учетом перехода через края.
+        """
+        return (b[0] - a[0] + 1) % self.width - 1, (b[1] - a[1] + 1) % self.height - 1
+
+    def piece(self, body, index, heading=(1, 0)):
+        """
+        Возвращает картинку для части тела с номером index. heading - направление головы змейки из одной клетки.
+        """
+        sprites = self.sprites
+        cell = body[index]
+        if index == 0:
+            if len(body) > 1:
+                heading = self.direction(body[1], cell)
+            return sprites.head.get(heading, sprites.head[(1, 0)])
+        forward = self.direction(cell, body[index - 1])
+        if index == len(body) - 1:
+            return sprites.tail.get(forward, sprites.tail[(1, 0)])
+        backward = self.direction(cell, body[index + 1])
+        return sprites.body.get(frozenset((forward, backward)), sprites.body[frozenset(((-1, 0), (1, 0)))])
+
+    def place(self, item, x, y):
+        self.canvas.coords(item, x * self.cell, y * self.cell)
+
+    def draw_snake(self, snake):
+        """
+        Переносит картинку хвоста на место головы и меняет картинки у головы, шеи и хвоста.
+        """
+        body = snake.body
+        head = body.head
+        items = self.snake_items
+        if len(items) < len(body):
+            item = self.canvas.create_image(head[0] * self.cell, head[1] * self.cell, anchor="nw")
+        else:
+            item = items.pop()
+            self.place(item, *head)
+        items.appendleft(item)
+        heading = self.direction(self.last_head, head) if self.last_head is not None else (1, 0)
+        self.canvas.itemconfig(item, image=self.piece(body, 0, heading))
+        if len(body) > 1:
+            self.canvas.itemconfig(items[1], image=self.piece(body, 1))
+            self.canvas.itemconfig(items[-1], image=self.piece(body, len(body) - 1))
+        self.last_head = head
+        self.follow(*head)
+
+    def undraw_snake(self, snake):
+        """
+        Переносит картинку головы на восстановленный хвост и меняет картинки у головы и хвоста.
+        """
+        body = snake.body
+        items = self.snake_items
+        item = items.popleft()
+        restored = len(items) < len(body)
+        if restored:
+            self.place(item, *body.tail)
+            items.append(item)
+        else:
+            self.canvas.delete(item)
+        self.canvas.itemconfig(items[0], image=self.piece(body, 0))
+        if len(body) > 1:
+            self.canvas.itemconfig(items[-1], image=self.piece(body, len(body) - 1))
+            if restored and len(body) > 2:
+                # Бывший хвост снова стал частью тела
+                self.canvas.itemconfig(items[-2], image=self.piece(body, len(body) - 2))
+        self.last_head = body.head
+        self.follow(*body.head)
+
+    def draw_body(self, body):
+        for item in self.snake_items:
+            self.canvas.delete(item)
+        self.snake_items.clear()
+        for index, (x, y) in enumerate(body):
+            self.snake_items.append(self.canvas.create_image(x * self.cell, y * self.cell, anchor="nw",
+                                                             image=self.piece(body, index)))
+        if len(body):
+            self.last_head = body.head
+            self.follow(*body.head)
+
+    def draw_food(self, food):
+        position = (food.x, food.y)
+        if self.food_item is None:
+            self.food_item = self.canvas.create_image(food.x * self.cell, food.y * self.cell, anchor="nw",
+                                                      image=self.sprites.food)
+        elif position != self.food_position:
+            self.place(self.food_item, food.x, food.y)
+        self.food_position = position
+
+    def draw_walls(self, walls):
+        self.canvas.delete("wall")
+        for wall in walls:
+            self.canvas.create_image(wall.x * self.cell, wall.y * self.cell, anchor="nw", image=self.sprites.wall,
+                                     tags="wall")
+
+
+class Run:
+    """
+    Участок тела, нарисованный одной ломаной.
+
+    vertices - клетки поворотов от головы к хвосту, cells - число клеток тела,
+    за которые отвечает участок. linked означает, что участок продолжает
+    следующий за ним (к хвосту) и делит с ним последнюю вершину.
+    """
+    __slots__ = ("item", "vertices", "cells", "linked")
+
+    def __init__(self, item, vertices, cells, linked):
+        self.item = item
+        self.vertices = vertices
+        self.cells = cells
+        self.linked = linked
+
+
+class PolylineRenderer(Renderer):
+    """
+    Рисует тело змейки ломаными с вершинами только в точках поворота.
+
+    Прямой отрезок тела - одна пара вершин, поэтому число элементов холста
+    зависит от числа поворотов, а не от длины змейки. Ломаная делится на
+    участки не длиннее MAX_VERTICES вершин и при переходе через край поля,
+    так что на шаге обновляются только координаты головного и хвостового участков.
+    """
+    def __init__(self, canvas, width, height, cell=10):
+        super().__init__(canvas, width, height, cell)
+        self.runs = deque()
+        self.length = 0
+        self.last_head = None
+
+    def reset(self):
+        super().reset()
+        self.runs.clear()
+        self.length = 0
+        self.last_head = None
+
+    def center(self, x, y):
+        half = self.cell / 2
+        return x * self.cell + half, y * self.cell + half
+
+    def redraw(self, run):
+        points = []
+        for x, y in run.vertices:
+            points.extend(self.center(x, y))
+        self.canvas.coords(run.item, *points)
+
+    def new_run(self, vertices, cells, linked, at_tail=False):
+        points = []
+        for x, y in vertices:
+            points.extend(self.center(x, y))
+        item = self.canvas.create_line(*points, fill="green", width=max(1, self.cell * 0.8), capstyle="round",
+                                       joinstyle="round")
+        if at_tail:
+            self.runs.append(Run(item, vertices, cells, linked))
+        else:
+            self.runs.appendleft(Run(item, vertices, cells, linked))
+
+    def push_head(self, head, previous):
+        x, y = head
+        px, py = previous
+        run = self.runs[0] if self.runs else None
+        adjacent = abs(x - px) + abs(y - py) == 1
+        if run is None or not adjacent:
+            # Первая клетка или переход через край поля: новый участок из одной точки
+            self.new_run(deque([head, head]), 1, False)
+            return
+        vertices = run.vertices
+        if len(vertices) >= MAX_VERTICES:
+            self.new_run(deque([head, previous]), 1, True)
+            return
+        first, second = vertices[0], vertices[1]
+        if first == second:
+            vertices[0] = head
+        elif (x - first[0], y - first[1]) == (first[0] - second[0], first[1] - second[1]):
+            # Голова продолжает прямой отрезок: сдвигаем его конец
+            vertices[0] = head
+        else:
+            vertices.appendleft(head)
+        run.cells += 1
+        self.redraw(run)
+
+    def shorten(self, run):
+        """
+        Убирает одну клетку с хвостового конца ломаной.
+        """
+        vertices = run.vertices
+        (x, y), (px, py) = vertices[-1], vertices[-2]
+        step = ((px > x) - (px < x), (py > y) - (py < y))
+        moved = (x + step[0], y + step[1])
+        if moved == (px, py) and len(vertices) > 2:
+            vertices.pop()
+        else:
+            vertices[-1] = moved
+        self.redraw(run)
+
+    def pop_tail(self):
+        run = self.runs[-1]
+        run.cells -= 1
+        if run.cells == 0:
+            self.canvas.delete(run.item)
+            self.runs.pop()
+            following = self.runs[-1] if self.runs else None
+            if following is not None and following.linked:
+                following.linked = False
+                self.shorten(following)
+        else:
+            self.shorten(run)
+
+    def pop_head(self):
+        """
+        Убирает одну клетку с головного конца ломаной.
+        """
+        run = self.runs[0]
+        run.cells -= 1
+        if run.cells == 0:
+            self.canvas.delete(run.item)
+            self.runs.popleft()
+            return
+        vertices = run.vertices
+        (x, y), (px, py) = vertices[0], vertices[1]
+        moved = (x + (px > x) - (px < x), y + (py > y) - (py < y))
+        if moved == (px, py) and len(vertices) > 2:
+            vertices.popleft()
+        else:
+            vertices[0] = moved
+        self.redraw(run)
+
+    def push_tail(self, tail, following):
+        """
+        Добавляет клетку tail к хвостовому концу ломаной; following - клетка тела перед ней.
+
+        Хвостовой участок может вырасти сверх MAX_VERTICES вершин: он все равно
+        укорачивается по мере движения змейки.
+        """
+        x, y = tail
+        fx, fy = following
+        run = self.runs[-1] if self.runs else None
+        if run is None or abs(x - fx) + abs(y - fy) != 1:
+            # Переход через край поля: новый участок из одной точки
+            self.new_run(deque([tail, tail]), 1, False, at_tail=True)
+            return
+        vertices = run.vertices
+        last, before = vertices[-1], vertices[-2]
+        if last == before or (x - last[0], y - last[1]) == (last[0] - before[0], last[1] - before[1]):
+            vertices[-1] = tail
+        else:
+            vertices.append(tail)
+        run.cells += 1
+        self.redraw(run)
+
+    def undraw_snake(self, snake):
+        """
+        Убирает клетку с головной ломаной и возвращает хвост, если он был восстановлен.
+        """
+        body = snake.body
+        self.pop_head()
+        if len(body) > self.length - 1:
+            self.push_tail(body.tail, body[-2] if len(body) > 1 else body.head)
+        self.length = len(body)
+        self.last_head = body.head
+        self.follow(*body.head)
+
+    def draw_body(self, body):
+        for run in self.runs:
+            self.canvas.delete(run.item)
+        self.runs.clear()
+        self.last_head = None
+        for cell in reversed(list(body)):
+            if self.last_head is None:
+                self.new_run(deque([cell, cell]), 1, False)
+            else:
+                self.push_head(cell, self.last_head)
+            self.last_head = cell
+        self.length = len(body)
+        if len(body):
+            self.follow(*body.head)
+
+    def draw_snake(self, snake):
+        """
+        Добавляет голову к головной ломаной и укорачивает хвостовую, если змейка не выросла.
+        """
+        body = snake.body
+        head = body.head
+        if self.length == 0:
+            self.new_run(deque([head, head]), 1, False)
+        else:
+            self.push_head(head, self.last_head)
+            if len(body) == self.length:
+                self.pop_tail()
+        self.length = len(body)
+        self.last_head = head
+        self.follow(*head)
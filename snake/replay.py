@@ -0,0 +1,184 @@
+"""
+Запись и воспроизведение игр.
+
+Запись хранит только зерно генератора и направления движения, сжатые
+в серии одинаковых значений. Этого достаточно, чтобы SnakeEngine без
+интерфейса повторил игру шаг в шаг.
+
+Формат записи: заголовок HEADER, затем серии в виде varint
+(длина серии << 2 | номер направления). Архив - последовательность
+записей, каждой из которых предшествует ее длина (4 байта).
+
+Архив лежит в каталоге данных игры (paths.py) и не растет без предела:
+когда он становится больше MAX_ARCHIVE_BYTES, в нем остаются только
+самые новые записи общим размером не больше половины предела.
+"""
+import random
+import struct
+
+from .engine import MOVES, SnakeEngine
+from .paths import data_path, ensure_parent
+
+MAGIC = b"SNKR"
+VERSION = 1
+# Сигнатура, версия, ширина, высота, стены, зерно, счет, шаг окончания игры, число серий
+HEADER = struct.Struct("<4sBHH?QIII")
+SIZE = struct.Struct("<I")
+# Имя архива в каталоге данных игры и его наибольший размер
+REPLAYS_FILE = "replays.bin"
+MAX_ARCHIVE_BYTES = 1 << 20
+
+
+def new_seed():
+    """
+    Возвращает случайное зерно для новой игры. 63 бита помещаются в INTEGER таблицы рекордов.
+    """
+    return random.SystemRandom().getrandbits(63)
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """
+    Запись одной игры: зерно и серии направлений по шагам.
+    """
+    def __init__(self, width, height, walls, seed):
+        self.width = width
+        self.height = height
+        self.walls = walls
+        self.seed = seed
+        self.runs = []
+        self.score = 0
+        self.ticks = 0
+
+    def record(self, direction):
+        """
+        Добавляет направление, с которым был сделан очередной шаг.
+        """
+        code = MOVES.index(direction)
+        if self.runs and self.runs[-1][1] == code:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, code])
+
+    def finish(self, engine):
+        """
+        Запоминает итоговый счет и шаг, на котором закончилась игра.
+        """
+        self.score = engine.score
+        self.ticks = engine.ticks
+
+    def directions(self):
+        for count, code in self.runs:
+            direction = MOVES[code]
+            for _ in range(count):
+                yield direction
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.width, self.height, self.walls, self.seed,
+                                    self.score, self.ticks, len(self.runs)))
+        for count, code in self.runs:
+            write_varint(out, count << 2 | code)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, width, height, walls, seed, score, ticks, runs = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("неизвестный формат записи игры")
+        replay = cls(width, height, walls, seed)
+        replay.score = score
+        replay.ticks = ticks
+        offset = HEADER.size
+        for _ in range(runs):
+            value, offset = read_varint(data, offset)
+            replay.runs.append([value >> 2, value & 3])
+        return replay
+
+    def append_to(self, path=None):
+        """
+        Дописывает запись в конец архива (по умолчанию - в каталоге данных игры), при необходимости
+        убирая из него старые записи. Ошибки записи выбрасываются как OSError.
+        """
+        path = data_path(REPLAYS_FILE) if path is None else path
+        data = self.to_bytes()
+        ensure_parent(path)
+        with open(path, "ab") as file:
+            file.write(SIZE.pack(len(data)) + data)
+            size = file.tell()
+        if size > MAX_ARCHIVE_BYTES:
+            trim_archive(path, MAX_ARCHIVE_BYTES // 2)
+
+
+def trim_archive(path, keep):
+    """
+    Оставляет в архиве самые новые целые записи общим размером не больше keep байт (но хотя бы одну).
+    """
+    from .snapshot import write_atomic
+
+    with open(path, "rb") as file:
+        data = file.read()
+    offsets = []
+    offset = 0
+    while offset + SIZE.size <= len(data):
+        size, = SIZE.unpack_from(data, offset)
+        if offset + SIZE.size + size > len(data):
+            break
+        offsets.append(offset)
+        offset += SIZE.size + size
+    if not offsets:
+        return
+    end = offset
+    start = next((offset for offset in offsets if end - offset <= keep), offsets[-1])
+    write_atomic(path, data[start:end])
+
+
+def read_archive(path=None):
+    """
+    Перебирает записи архива (по умолчанию - в каталоге данных игры).
+    """
+    path = data_path(REPLAYS_FILE) if path is None else path
+    with open(path, "rb") as file:
+        while True:
+            size = file.read(SIZE.size)
+            if len(size) < SIZE.size:
+                return
+            yield Replay.from_bytes(file.read(SIZE.unpack(size)[0]))
+
+
+def play_back(replay):
+    """
+    Повторяет игру без интерфейса и возвращает движок в конечном состоянии.
+    """
+    engine = SnakeEngine(replay.width, replay.height, walls=replay.walls, seed=replay.seed)
+    for direction in replay.directions():
+        if engine.done:
+            break
+        # Направление задается напрямую: запись уже содержит то, что было применено на шаге
+        engine.direction = direction
+        engine.step()
+    return engine
+
+
+def verify(replay):
+    """
+    Проверяет, что повтор дает тот же счет и тот же шаг окончания игры.
+    """
+    engine = play_back(replay)
+    return engine.score == replay.score and engine.ticks == replay.ticks
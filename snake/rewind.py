@@ -0,0 +1,90 @@
+"""
+Перемотка игры назад.
+
+Rewind хранит последние capacity шагов в кольцевом буфере заранее
+выделенных массивов. Шаг записывается как небольшая разница: клетка
+освобожденного хвоста, направление до шага и еда до шага, если она
+была съедена. Голову хранить не нужно: при отмене снимается текущая
+голова. Стены запоминаются только на шагах, где они сменились. Запись и
+отмена шага стоят O(1) и не зависят от длины змейки, а память не растет
+с длиной партии: старые шаги перезаписываются.
+"""
+from array import array
+
+from .engine import MOVES, Food
+
+# Сколько последних шагов можно отменить
+CAPACITY = 512
+# Отметка "змейка выросла, хвост не освобождался" и "еда не съедена"
+NONE = -1
+
+
+class Rewind:
+    """
+    Кольцевой буфер последних шагов SnakeEngine.
+
+    Перед шагом движка запоминаются его direction, food, walls и
+    wall_cells, после шага они передаются в record() вместе с итогом шага.
+    undo() отменяет последний записанный шаг через SnakeEngine.retreat.
+    """
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.tails = array("i", [NONE]) * capacity
+        self.directions = bytearray(capacity)
+        self.foods = array("i", [NONE]) * capacity
+        self.food_directions = bytearray(capacity)
+        self.intervals = array("H", bytes(2 * capacity))
+        # Стены до шага по номеру ячейки буфера, только для шагов, сменивших стены
+        self.walls = {}
+        self.end = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.walls.clear()
+        self.count = 0
+
+    def record(self, engine, result, direction, food, walls, wall_cells):
+        """
+        Записывает шаг. direction, food, walls и wall_cells - значения движка до шага.
+        """
+        slot = self.end
+        width = engine.width
+        self.tails[slot] = NONE if result.tail is None else result.tail[1] * width + result.tail[0]
+        self.directions[slot] = MOVES.index(direction)
+        if result.ate:
+            self.foods[slot] = food.y * width + food.x
+            self.food_directions[slot] = MOVES.index(food.direction)
+        else:
+            self.foods[slot] = NONE
+        self.intervals[slot] = min(engine.speed, 0xFFFF)
+        if result.walls_changed:
+            self.walls[slot] = (walls, wall_cells)
+        else:
+            self.walls.pop(slot, None)
+        self.end = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def last_interval(self):
+        """
+        Интервал в мс, с которым был сделан последний записанный шаг.
+        """
+        return self.intervals[(self.end - 1) % self.capacity]
+
+    def undo(self, engine):
+        """
+        Отменяет последний записанный шаг. Возвращает True, если при этом вернулись старые стены.
+        """
+        self.end = slot = (self.end - 1) % self.capacity
+        self.count -= 1
+        width = engine.width
+        tail = self.tails[slot]
+        food = self.foods[slot]
+        walls, wall_cells = self.walls.pop(slot, (None, None))
+        engine.retreat(None if tail == NONE else (tail % width, tail // width), MOVES[self.directions[slot]],
+                       None if food == NONE else Food(food % width, food // width,
+                                                      MOVES[self.food_directions[slot]]),
+                       walls, wall_cells)
+        return walls is not None
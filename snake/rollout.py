@@ -0,0 +1,133 @@
+"""
+Параллельный сбор траекторий на всех ядрах.
+
+Игры распределяются по процессам, у каждого процесса свой генератор
+случайных чисел с собственным зерном. Траектории записываются прямо
+в разделяемую память и не пересылаются родителю через pickle.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .engine import MOVES, SnakeEngine
+
+
+class Trajectories:
+    """
+    Буферы траекторий в разделяемой памяти.
+
+    Для каждого шага хранятся состояние (клетка головы, клетка еды, длина),
+    действие (-1 - без поворота, 0..3 - Up, Down, Left, Right), награда
+    и признак окончания игры.
+
+    close() отпускает все выданные view(): после него обращение к ним
+    выбрасывает ValueError, а разделяемая память освобождается, даже если
+    на view еще остались ссылки.
+    """
+    # Поле, формат array/memoryview и число значений на шаг
+    FIELDS = (
+        ("states", "i", 3),
+        ("actions", "b", 1),
+        ("rewards", "i", 1),
+        ("dones", "B", 1),
+    )
+    ITEM_SIZES = {"i": 4, "b": 1, "B": 1}
+
+    def __init__(self, size, names=None):
+        self.size = size
+        self.owner = names is None
+        self.blocks = {}
+        self.views = []
+        for field, code, width in self.FIELDS:
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=size * width * self.ITEM_SIZES[code])
+            else:
+                block = shared_memory.SharedMemory(name=names[field])
+            self.blocks[field] = block
+
+    @property
+    def names(self):
+        return {field: block.name for field, block in self.blocks.items()}
+
+    def view(self, field):
+        """
+        Возвращает memoryview поля без копирования.
+        """
+        for name, code, width in self.FIELDS:
+            if name == field:
+                view = self.blocks[field].buf[:self.size * width * self.ITEM_SIZES[code]].cast(code)
+                self.views.append(view)
+                return view
+        raise KeyError(field)
+
+    def close(self):
+        # Пока на буфер блока есть живые memoryview, block.close() выбрасывает BufferError
+        for view in self.views:
+            view.release()
+        self.views.clear()
+        blocks = list(self.blocks.values())
+        self.blocks.clear()
+        # Имена сегментов убираются первыми: если какой-то буфер все же не закрыть, память не утечет
+        if self.owner:
+            for block in blocks:
+                block.unlink()
+        for block in blocks:
+            block.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def rollout_shard(names, size, start, count, width, height, walls, seed):
+    """
+    Играет случайной стратегией и пишет count шагов в буферы начиная с позиции start.
+    """
+    rng = random.Random(seed)
+    engine = SnakeEngine(width, height, walls=walls, rng=rng)
+    buffers = Trajectories(size, names)
+    states = buffers.view("states")
+    actions = buffers.view("actions")
+    rewards = buffers.view("rewards")
+    dones = buffers.view("dones")
+    try:
+        for i in range(start, start + count):
+            body = engine.snake.body
+            states[3 * i] = body.head_cell
+            states[3 * i + 1] = engine.food.y * width + engine.food.x
+            states[3 * i + 2] = len(body)
+            action = rng.randrange(-1, 4)
+            actions[i] = action
+            result = engine.step(MOVES[action] if action >= 0 else None)
+            rewards[i] = 5 if result.ate else 0
+            dones[i] = result.done
+            if result.done:
+                engine.reset()
+    finally:
+        buffers.close()
+    return count
+
+
+def collect(steps, workers=None, width=40, height=40, walls=False, seed=0):
+    """
+    Собирает steps шагов на workers процессах и возвращает Trajectories.
+
+    Буферы принадлежат вызывающему и освобождаются через close() или with.
+    """
+    workers = workers or os.cpu_count() or 1
+    buffers = Trajectories(steps)
+    shard = -(-steps // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for worker in range(workers):
+            start = worker * shard
+            count = min(shard, steps - start)
+            if count > 0:
+                futures.append(pool.submit(rollout_shard, buffers.names, steps, start, count,
+                                           width, height, walls, seed + worker))
+        for future in futures:
+            future.result()
+    return buffers
@@ -0,0 +1,70 @@
+from time import monotonic
+
+
+class TickScheduler:
+    """
+    Запускает шаги игры с постоянным интервалом по монотонным часам.
+
+    Время, прошедшее с прошлого вызова, копится в accumulator, и за один
+    вызов выполняется столько шагов, сколько в нем уместилось (не больше
+    max_catch_up), поэтому долгая отрисовка не замедляет игру. Отложенный
+    вызов всегда один: повторный start() ничего не делает, а stop()
+    отменяет его.
+
+    Во время шага deadline - момент по monotonic(), к которому этот шаг
+    должен был начаться; вне вызова из цикла он равен None.
+    """
+    def __init__(self, root, tick, interval, max_catch_up=5):
+        self.root = root
+        self.tick = tick
+        self.interval = interval
+        self.max_catch_up = max_catch_up
+        self.handle = None
+        self.running = False
+        self.accumulator = 0.0
+        self.last = 0.0
+        self.deadline = None
+
+    def start(self):
+        """
+        Запускает цикл. Первый шаг выполняется сразу.
+        """
+        if self.running:
+            return
+        self.running = True
+        self.last = monotonic()
+        self.accumulator = float(self.interval())
+        self.handle = self.root.after(0, self.run)
+
+    def stop(self):
+        """
+        Останавливает цикл и отменяет отложенный вызов.
+        """
+        self.running = False
+        if self.handle is not None:
+            self.root.after_cancel(self.handle)
+            self.handle = None
+
+    def run(self):
+        self.handle = None
+        now = monotonic()
+        self.accumulator += (now - self.last) * 1000
+        self.last = now
+
+        interval = self.interval()
+        ticks = 0
+        while self.running and self.accumulator >= interval and ticks < self.max_catch_up:
+            self.accumulator -= interval
+            ticks += 1
+            # Остаток накопителя - на сколько мс этот шаг опаздывает к своему сроку
+            self.deadline = now - self.accumulator / 1000
+            self.tick()
+            interval = self.interval()
+        self.deadline = None
+        if not self.running or self.handle is not None:
+            # Цикл остановлен или перезапущен во время шага
+            return
+        if self.accumulator >= interval:
+            # Не догоняем отставание, накопленное сверх max_catch_up шагов
+            self.accumulator = float(interval)
+        self.handle = self.root.after(max(1, int(interval - self.accumulator)), self.run)
@@ -0,0 +1,181 @@
+"""
+Сервер арены для игры по сети.
+
+Сервер ведет одну общую арену (ArenaEngine) и делает шаги с постоянным
+интервалом. Каждый клиент по TCP получает свою змейку с управлением как
+у клавиатуры: присланные направления копятся в очереди поворотов. После
+шага всем клиентам рассылается один и тот же кадр изменений (protocol.py),
+а новый клиент сначала получает снимок всей арены.
+
+Подключения, отключения и шаги меняют арену только внутри шага, поэтому
+снимок нового клиента и следующий за ним кадр изменений всегда согласованы.
+
+Запуск: python -m snake.server [--host 127.0.0.1] [--port 8765] [--width 100] [--height 100]
+"""
+import argparse
+import asyncio
+import time
+from collections import deque
+
+from .arena import ArenaEngine, KeyboardController
+from .engine import MOVES
+from .protocol import encode_delta, encode_snapshot
+
+PORT = 8765
+# Очередь подключений сокета: сотни клиентов могут подключаться одновременно
+BACKLOG = 1024
+# Клиент, который не успевает читать и накопил столько неотправленных байт, отключается
+WRITE_LIMIT = 1 << 20
+
+
+class Client:
+    __slots__ = ("writer", "controller", "index")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.controller = KeyboardController()
+        self.index = None
+
+
+class ArenaServer:
+    """
+    Общая арена и рассылка изменений подключенным клиентам.
+
+    latencies хранит длительность последних шагов в мс (шаг арены,
+    кодирование и запись кадров всем клиентам), lateness - насколько позже
+    назначенного времени шаг начался.
+    """
+    def __init__(self, width=100, height=100, food=20, tick=100, seed=None, history=10000):
+        self.engine = ArenaEngine(width, height, [], food=food, respawn=True, seed=seed)
+        self.tick = tick
+        self.ticks = 0
+        self.clients = []
+        self.joining = []
+        self.leaving = []
+        self.latencies = deque(maxlen=history)
+        self.lateness = deque(maxlen=history)
+        self.bytes_sent = 0
+        self.server = None
+        self.running = False
+
+    async def handle(self, reader, writer):
+        client = Client(writer)
+        self.joining.append(client)
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                for code in data:
+                    if code < len(MOVES):
+                        client.controller.queue_turn(MOVES[code])
+        except ConnectionError:
+            pass
+        finally:
+            self.disconnect(client)
+
+    def disconnect(self, client):
+        if client in self.joining:
+            self.joining.remove(client)
+        elif client in self.clients:
+            self.clients.remove(client)
+            self.leaving.append(client.index)
+        client.writer.close()
+
+    def send(self, client, data):
+        writer = client.writer
+        if writer.transport.get_write_buffer_size() > WRITE_LIMIT:
+            self.disconnect(client)
+            return
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    def step(self):
+        """
+        Выполняет один шаг: уходы, подключения, ход арены и рассылка.
+        """
+        engine = self.engine
+        left = self.leaving
+        self.leaving = []
+        for index in left:
+            engine.remove_snake(index)
+
+        joined = self.joining
+        self.joining = []
+        spawned = []
+        for client in joined:
+            client.index = engine.add_snake(client.controller)
+            snake = engine.snakes[client.index]
+            if snake.alive:
+                spawned.append((client.index, snake.body.head))
+
+        result = engine.step()
+        self.ticks += 1
+        data = encode_delta(engine, self.ticks, left, spawned + result.spawned, result)
+        for client in list(self.clients):
+            self.send(client, data)
+        for client in joined:
+            self.clients.append(client)
+            self.send(client, encode_snapshot(engine, self.ticks, client.index))
+
+    async def run(self):
+        """
+        Делает шаги с интервалом tick мс, не накапливая отставание.
+        """
+        loop = asyncio.get_running_loop()
+        interval = self.tick / 1000
+        deadline = loop.time()
+        self.running = True
+        while self.running:
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            late = max(0.0, loop.time() - deadline)
+            self.lateness.append(late * 1000)
+            if late > interval:
+                # Шаг опоздал больше чем на интервал: начинаем отсчет заново, а не догоняем
+                deadline = loop.time()
+            start = time.perf_counter()
+            self.step()
+            self.latencies.append((time.perf_counter() - start) * 1000)
+
+    async def serve(self, host="127.0.0.1", port=PORT):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=BACKLOG)
+        async with self.server:
+            await self.run()
+
+    def stop(self):
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """
+    Возвращает перцентили значений по ближайшему рангу.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": 0.0 for point in points}
+    return {f"p{point}": ordered[min(len(ordered) - 1, len(ordered) * point // 100)] for point in points}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервер арены")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=100)
+    parser.add_argument("--food", type=int, default=20)
+    parser.add_argument("--tick", type=int, default=100, help="интервал шага в мс")
+    args = parser.parse_args()
+    server = ArenaServer(args.width, args.height, food=args.food, tick=args.tick)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
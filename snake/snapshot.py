@@ -0,0 +1,217 @@
+"""
+Снимки состояния игры посреди партии.
+
+Снимок хранит все, что нужно SnakeEngine, чтобы продолжить игру: размер
+поля, счет, скорость и ее множитель, шаг, направление, еду, стены и
+змейку. Тело записано цепочкой направлений: клетка головы, а дальше
+для каждой следующей части 2 бита - в какую сторону от предыдущей она
+лежит (четыре части на байт). Генератор случайных чисел в снимок не
+входит: после восстановления еда появляется по новому генератору.
+
+Формат снимка: заголовок HEADER, номера клеток стен (по 4 байта),
+цепочка тела. Файл снимков - последовательность снимков, каждому из
+которых предшествует его длина (4 байта), как в архиве записей игр.
+Файл записывается целиком во временный файл и подменяет старый через
+os.replace, поэтому прерванная запись не портит сохраненные снимки.
+SnapshotFile читает файл через mmap: заголовки перебираются без
+разбора стен и тела, а целиком восстанавливаются только нужные снимки.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from collections import namedtuple
+
+from .body import FreeCells, Snake
+from .engine import MOVES, Food, SnakeEngine, Wall
+
+MAGIC = b"SNKS"
+VERSION = 1
+# Сигнатура, версия, ширина, высота, стены включены, начальный интервал, интервал, множитель скорости,
+# счет, шаг, направление, еда (x, y, направление), число стен, длина змейки, клетка головы
+HEADER = struct.Struct("<4sBHH?HHdIIBHHBBII")
+SIZE = struct.Struct("<I")
+SNAPSHOT_PATH = "snapshot.bin"
+# Снимок, который игра пишет сама при закрытии окна, чтобы не затереть сохраненный игроком
+AUTOSAVE_PATH = "autosave.bin"
+
+# Заголовок снимка без сигнатуры и версии
+Header = namedtuple("Header", "width height walls base_speed speed speed_multiplier score ticks direction "
+                              "food_x food_y food_direction wall_count length head")
+
+
+def body_chain(body):
+    """
+    Кодирует тело от головы к хвосту: по 2 бита на часть после головы.
+    """
+    width, height = body.width, body.height
+    chain = bytearray((len(body) + 2) // 4)
+    previous = body.head_cell
+    for i in range(1, len(body)):
+        cell = body.cells[(body.start + i) % body.capacity]
+        step = ((cell % width - previous % width + 1) % width - 1, (cell // width - previous // width + 1) % height - 1)
+        if step not in MOVES:
+            raise ValueError("части тела змейки не соседние")
+        chain[(i - 1) >> 2] |= MOVES.index(step) << ((i - 1) & 3) * 2
+        previous = cell
+    return chain
+
+
+def to_bytes(engine):
+    """
+    Возвращает снимок состояния игры.
+    """
+    body = engine.snake.body
+    food = engine.food
+    out = bytearray(HEADER.pack(MAGIC, VERSION, engine.width, engine.height, engine.walls_enabled,
+                                engine.base_speed, engine.speed, engine.speed_multiplier, engine.score,
+                                engine.ticks, MOVES.index(engine.direction), food.x, food.y,
+                                MOVES.index(food.direction), len(engine.walls), len(body), body.head_cell))
+    for wall in engine.walls:
+        out += SIZE.pack(wall.y * engine.width + wall.x)
+    out += body_chain(body)
+    return bytes(out)
+
+
+def read_header(data, offset=0):
+    """
+    Разбирает только заголовок снимка.
+    """
+    magic, version, *fields = HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("неизвестный формат снимка игры")
+    return Header(*fields)
+
+
+def restore(data, offset=0, engine=None):
+    """
+    Восстанавливает игру из снимка, начинающегося в data с позиции offset.
+
+    Если передан engine, состояние загружается в него (размер поля должен
+    совпадать), иначе создается новый SnakeEngine.
+    """
+    header = read_header(data, offset)
+    width, height = header.width, header.height
+    if engine is None:
+        engine = SnakeEngine(width, height, walls=header.walls, speed=header.base_speed)
+    elif (engine.width, engine.height) != (width, height):
+        raise ValueError("снимок сделан на поле другого размера")
+    engine.walls_enabled = header.walls
+    engine.base_speed = header.base_speed
+    engine.seed = None
+    engine.free = FreeCells(width * height)
+
+    offset += HEADER.size
+    engine.walls = []
+    engine.wall_cells = set()
+    for _ in range(header.wall_count):
+        cell, = SIZE.unpack_from(data, offset)
+        offset += SIZE.size
+        engine.walls.append(Wall(cell % width, cell // width))
+        engine.wall_cells.add((cell % width, cell // width))
+    for x, y in engine.wall_cells:
+        engine.free.block(y * width + x)
+
+    cell = header.head
+    engine.snake = Snake(cell % width, cell // width, width, height, engine.free)
+    body = engine.snake.body
+    for i in range(header.length - 1):
+        dx, dy = MOVES[data[offset + (i >> 2)] >> (i & 3) * 2 & 3]
+        cell = (cell // width + dy) % height * width + (cell % width + dx) % width
+        body.push_tail(cell % width, cell // width)
+
+    engine.food = Food(header.food_x, header.food_y, MOVES[header.food_direction])
+    engine.direction = MOVES[header.direction]
+    engine.snake.direction = engine.direction
+    engine.turns.clear()
+    engine.score = header.score
+    engine.speed = header.speed
+    engine.speed_multiplier = header.speed_multiplier
+    engine.ticks = header.ticks
+    engine.done = False
+    return engine
+
+
+def write_atomic(path, data):
+    """
+    Записывает файл целиком: сначала во временный файл рядом, затем подменяет им старый.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def save_many(engines, path=SNAPSHOT_PATH):
+    """
+    Записывает файл со снимками нескольких игр.
+    """
+    out = bytearray()
+    for engine in engines:
+        data = to_bytes(engine)
+        out += SIZE.pack(len(data))
+        out += data
+    write_atomic(path, out)
+
+
+def save(engine, path=SNAPSHOT_PATH):
+    """
+    Записывает файл с одним снимком игры.
+    """
+    save_many([engine], path)
+
+
+def load(path=SNAPSHOT_PATH, engine=None):
+    """
+    Восстанавливает игру из первого снимка файла.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    return restore(data, SIZE.size, engine)
+
+
+class SnapshotFile:
+    """
+    Файл снимков, отображенный в память.
+
+    headers() перебирает (позицию, заголовок) всех снимков, читая только
+    заголовки; restore(позиция) восстанавливает один снимок целиком.
+    """
+    def __init__(self, path=SNAPSHOT_PATH):
+        with open(path, "rb") as file:
+            # Пустой файл нельзя отобразить в память
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def offsets(self):
+        """
+        Перебирает позиции снимков в файле.
+        """
+        offset = 0
+        while offset + SIZE.size <= len(self.data):
+            size, = SIZE.unpack_from(self.data, offset)
+            yield offset + SIZE.size
+            offset += SIZE.size + size
+
+    def headers(self):
+        for offset in self.offsets():
+            yield offset, read_header(self.data, offset)
+
+    def restore(self, offset, engine=None):
+        return restore(self.data, offset, engine)
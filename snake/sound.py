@@ -0,0 +1,126 @@
+"""
+Звуковые эффекты.
+
+Звук проигрывается в отдельном потоке: игровой цикл только кладет имя
+эффекта в ограниченную очередь и никогда не ждет. Если очередь полна,
+эффект отбрасывается. Поток при запуске загружает pygame и заранее
+декодирует все звуки, а число одновременно звучащих эффектов ограничено
+числом каналов микшера: когда все каналы заняты, новый эффект не звучит.
+
+Если pygame не установлен, нет файлов звуков или звуковое устройство не
+открывается (например, на сервере без звуковой карты), используется
+NullBackend, и игра идет без звука.
+"""
+import queue
+import threading
+
+SOUNDS = {"eat": "eat.wav", "collision": "collision.wav"}
+# Сколько эффектов может звучать одновременно
+CHANNELS = 4
+# Сколько эффектов может ждать потока звука
+QUEUE_SIZE = 16
+
+
+class NullBackend:
+    """
+    Звук без устройства: эффекты никуда не выводятся.
+    """
+    def play(self, name):
+        pass
+
+    def close(self):
+        pass
+
+
+class PygameBackend:
+    """
+    Микшер pygame с заранее загруженными звуками.
+    """
+    def __init__(self, pygame, paths, channels=CHANNELS):
+        self.pygame = pygame
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(channels)
+        self.sounds = {name: pygame.mixer.Sound(path) for name, path in paths.items()}
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        # find_channel() без аргумента не прерывает звучащие эффекты и возвращает None, если свободных каналов нет
+        channel = self.pygame.mixer.find_channel()
+        if sound is not None and channel is not None:
+            channel.play(sound)
+
+    def close(self):
+        self.pygame.mixer.quit()
+
+
+def open_backend(paths=SOUNDS, channels=CHANNELS):
+    """
+    Открывает микшер pygame или возвращает NullBackend, если звук недоступен.
+    """
+    try:
+        import pygame
+    except ImportError:
+        return NullBackend()
+    try:
+        return PygameBackend(pygame, paths, channels)
+    except (pygame.error, FileNotFoundError):
+        return NullBackend()
+
+
+class SoundManager:
+    """
+    Очередь звуковых эффектов и поток, который их проигрывает.
+
+    Поток запускается методом start() или при первом эффекте. Пока он
+    загружает звуки, эффекты копятся в очереди.
+    """
+    def __init__(self, paths=SOUNDS, channels=CHANNELS, queue_size=QUEUE_SIZE, backend_factory=open_backend):
+        self.paths = paths
+        self.channels = channels
+        self.backend_factory = backend_factory
+        self.queue = queue.Queue(queue_size)
+        self.thread = None
+        self.backend = None
+        self.dropped = 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="sound", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        self.backend = self.backend_factory(self.paths, self.channels)
+        while True:
+            name = self.queue.get()
+            if name is None:
+                break
+            self.backend.play(name)
+        self.backend.close()
+
+    def play(self, name):
+        """
+        Ставит эффект в очередь, не дожидаясь его проигрывания.
+        """
+        self.start()
+        try:
+            self.queue.put_nowait(name)
+        except queue.Full:
+            self.dropped += 1
+
+    def play_eat_sound(self):
+        self.play("eat")
+
+    def play_collision_sound(self):
+        self.play("collision")
+
+    def close(self, timeout=1.0):
+        """
+        Останавливает поток звука.
+        """
+        if self.thread is not None:
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self.thread.join(timeout)
+            self.thread = None
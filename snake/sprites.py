@@ -0,0 +1,112 @@
+"""
+Готовые изображения клеток для отрисовки змейки, еды и стен.
+
+Изображения строятся один раз на интерпретатор Tk, размер клетки и тему
+и хранятся в CACHE, поэтому при отрисовке Tk только переставляет готовые
+картинки и ничего не растеризует заново. Картинки принадлежат
+интерпретатору окна, в котором созданы: после уничтожения окна и
+создания нового (например, при нескольких замерах подряд) их имена в
+новом интерпретаторе не существуют, поэтому интерпретатор входит в ключ.
+"""
+import tkinter as tk
+
+from .engine import DIRECTIONS
+
+UP, DOWN, LEFT, RIGHT = (DIRECTIONS[name] for name in ("Up", "Down", "Left", "Right"))
+
+THEMES = {
+    "classic": {"body": "#2e8b57", "head": "#006400", "eye": "#ffffff", "food": "#ff0000", "wall": "#808080",
+                "wall_border": "#505050"},
+    "dark": {"body": "#7fbf3f", "head": "#4f8f1f", "eye": "#000000", "food": "#ff7f50", "wall": "#606060",
+             "wall_border": "#303030"},
+}
+
+# Наборы изображений по (интерпретатор Tk, размер клетки, тема)
+CACHE = {}
+
+
+def get_sprites(master, cell, theme="classic"):
+    """
+    Возвращает набор изображений для виджета master и клетки размера cell, создавая его при первом запросе.
+    """
+    key = (master.tk, cell, theme)
+    sprites = CACHE.get(key)
+    if sprites is None:
+        sprites = CACHE[key] = Sprites(master, cell, THEMES[theme])
+    return sprites
+
+
+class Sprites:
+    """
+    Изображения одной темы для одного размера клетки.
+
+    body - части тела по паре сторон, к которым они примыкают (прямые и
+    углы), head - голова по направлению движения, tail - хвост по
+    направлению к остальному телу.
+    """
+    def __init__(self, master, cell, colors):
+        self.master = master
+        self.cell = cell
+        self.colors = colors
+        margin = max(1, cell // 8)
+        self.margin = margin
+        self.body = {}
+        for a, b in ((LEFT, RIGHT), (UP, DOWN), (UP, LEFT), (UP, RIGHT), (DOWN, LEFT), (DOWN, RIGHT)):
+            self.body[frozenset((a, b))] = self.segment((a, b), colors["body"])
+        self.head = {}
+        self.tail = {}
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            back = (-direction[0], -direction[1])
+            self.head[direction] = self.segment((back,), colors["head"], eyes=direction)
+            self.tail[direction] = self.segment((direction,), colors["body"], taper=True)
+        self.food = self.image()
+        self.fill_circle(self.food, colors["food"])
+        self.wall = self.image()
+        self.wall.put(colors["wall_border"], to=(0, 0, cell, cell))
+        self.wall.put(colors["wall"], to=(1, 1, cell - 1, cell - 1))
+
+    def image(self):
+        return tk.PhotoImage(master=self.master, width=self.cell, height=self.cell)
+
+    def segment(self, sides, color, eyes=None, taper=False):
+        """
+        Рисует центральный квадрат и полосы от него к сторонам sides.
+        """
+        cell, margin = self.cell, self.margin
+        image = self.image()
+        inset = margin * 2 if taper else margin
+        image.put(color, to=(inset, inset, cell - inset, cell - inset))
+        for dx, dy in sides:
+            x1 = 0 if dx < 0 else (cell - inset if dx > 0 else margin)
+            x2 = inset if dx < 0 else (cell if dx > 0 else cell - margin)
+            y1 = 0 if dy < 0 else (cell - inset if dy > 0 else margin)
+            y2 = inset if dy < 0 else (cell if dy > 0 else cell - margin)
+            image.put(color, to=(x1, y1, x2, y2))
+        if eyes is not None and cell >= 6:
+            self.put_eyes(image, eyes)
+        return image
+
+    def put_eyes(self, image, direction):
+        cell = self.cell
+        size = max(1, cell // 6)
+        dx, dy = direction
+        # Глаза стоят ближе к переднему краю головы, по обе стороны от оси движения
+        front = cell // 2 + (cell // 4) * (dx or dy)
+        for side in (cell // 3, cell - cell // 3):
+            x, y = (front, side) if dx else (side, front)
+            left, top = x - size // 2, y - size // 2
+            image.put(self.colors["eye"], to=(left, top, left + size, top + size))
+
+    def fill_circle(self, image, color):
+        cell, margin = self.cell, self.margin
+        radius = cell / 2 - margin
+        center = (cell - 1) / 2
+        for y in range(cell):
+            half = radius * radius - (y - center) ** 2
+            if half < 0:
+                continue
+            half = half ** 0.5
+            x1 = max(0, round(center - half))
+            x2 = min(cell, round(center + half) + 1)
+            if x1 < x2:
+                image.put(color, to=(x1, y, x2, y + 1))
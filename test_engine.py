@@ -0,0 +1,375 @@
+"""
+Проверки игрового движка без интерфейса.
+
+Запуск: python -m unittest test_engine
+"""
+import os
+import random
+import tempfile
+import unittest
+from collections import deque
+from unittest import mock
+
+import bench
+from snake.arena import ArenaEngine, KeyboardController, ScriptedController
+from snake.autopilot import UNREACHABLE, Autopilot, DistanceField, neighbor_table
+from snake import replay
+from snake.rollout import Trajectories
+from snake.engine import DIRECTIONS, MOVES, TURN_QUEUE_SIZE, SnakeEngine
+
+
+def scan_collision(engine):
+    """
+    Столкновение, найденное перебором тела и стен, как до сетки занятости.
+    """
+    body = list(engine.snake.body)
+    head = body[0]
+    return head in body[1:] or any((wall.x, wall.y) == head for wall in engine.walls)
+
+
+class CollisionTest(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        rng = random.Random(0)
+        engine = SnakeEngine(12, 9, walls=True, seed=0)
+        engine.update_walls()
+        bodies = walls = 0
+        for _ in range(20000):
+            result = engine.step(rng.choice(MOVES))
+            self.assertEqual(engine.check_collision(), scan_collision(engine))
+            self.assertEqual(result.done, scan_collision(engine))
+            if result.done:
+                if engine.snake.body.head in engine.wall_cells:
+                    walls += 1
+                else:
+                    bodies += 1
+                engine.reset()
+                engine.update_walls()
+        # Случайные блуждания должны заканчиваться и о тело, и о стены
+        self.assertGreater(bodies, 0)
+        self.assertGreater(walls, 0)
+
+
+# Пределы для тела змейки: байт памяти на часть тела и живых блоков памяти, остающихся после шага
+BYTES_PER_SEGMENT = 16
+BLOCKS_PER_TICK = 0.1
+
+
+class TupleDequeSnake:
+    """
+    Тело очередью кортежей координат - представление, к которому нельзя вернуться.
+    """
+    def __init__(self, length, width):
+        self.width = width
+        self.body = deque((i % width, i // width) for i in range(length))
+
+    def move(self, dx, dy):
+        x, y = self.body[0]
+        self.body.appendleft(((x + dx) % self.width, y))
+        self.body.pop()
+
+
+class BodyMemoryTest(unittest.TestCase):
+    def test_bytes_per_segment_and_blocks_per_tick(self):
+        result = bench.bench_body_memory(length=1000, ticks=1000)
+        self.assertLessEqual(result["bytes_per_segment"], BYTES_PER_SEGMENT)
+        self.assertLessEqual(result["allocations_per_tick"], BLOCKS_PER_TICK)
+
+    def test_tuple_deque_exceeds_limit(self):
+        _, size, _ = bench.measure(TupleDequeSnake, 1000, 40)
+        self.assertGreater(size / 1000, BYTES_PER_SEGMENT)
+
+
+def free_cells(engine):
+    return set(engine.free.cells[:len(engine.free)])
+
+
+def expected_free(engine):
+    taken = set(engine.snake.body) | engine.wall_cells
+    return {y * engine.width + x for y in range(engine.height) for x in range(engine.width) if (x, y) not in taken}
+
+
+class FoodTest(unittest.TestCase):
+    def filled_engine(self, length, width=10, height=10):
+        """
+        Движок со змейкой длины length, уложенной по строкам поля, и стенами.
+        """
+        engine = SnakeEngine(width, height, walls=True, seed=1)
+        body = engine.snake.body
+        body.pop_tail()
+        for i in range(length):
+            y, x = divmod(i, width)
+            body.push_head(x if y % 2 == 0 else width - 1 - x, y)
+        engine.update_walls()
+        return engine
+
+    def test_never_on_snake_or_walls(self):
+        engine = self.filled_engine(90)
+        allowed = expected_free(engine)
+        for _ in range(10000):
+            food = engine.spawn_food()
+            self.assertIn(food.y * engine.width + food.x, allowed)
+
+    def test_uniform_over_free_cells(self):
+        engine = self.filled_engine(60)
+        cells = sorted(expected_free(engine))
+        samples = 2000 * len(cells)
+        counts = dict.fromkeys(cells, 0)
+        for _ in range(samples):
+            food = engine.spawn_food()
+            counts[food.y * engine.width + food.x] += 1
+        expected = samples / len(cells)
+        chi_square = sum((count - expected) ** 2 / expected for count in counts.values())
+        # При равномерном выборе статистика близка к числу степеней свободы, отклонение - порядка sqrt(2k)
+        freedom = len(cells) - 1
+        self.assertLess(abs(chi_square - freedom), 5 * (2 * freedom) ** 0.5)
+
+    def test_free_cells_follow_snake_and_walls(self):
+        rng = random.Random(2)
+        engine = SnakeEngine(12, 9, walls=True, seed=2)
+        for tick in range(5000):
+            if tick % 50 == 0:
+                engine.update_walls()
+            if engine.step(rng.choice(MOVES)).done:
+                engine.reset()
+            self.assertEqual(free_cells(engine), expected_free(engine))
+
+
+class TurnQueueTest(unittest.TestCase):
+    def setUp(self):
+        # Змейка из одной клетки в середине поля движется вправо
+        self.engine = SnakeEngine(20, 20, seed=3)
+        self.engine.food.x, self.engine.food.y = 0, 0
+
+    def press(self, *names):
+        for name in names:
+            self.engine.queue_turn(DIRECTIONS[name])
+
+    def test_two_turns_in_one_tick_apply_on_consecutive_ticks(self):
+        x, y = self.engine.snake.body.head
+        self.press("Up", "Left")
+        self.engine.step()
+        self.assertEqual(self.engine.direction, DIRECTIONS["Up"])
+        self.assertEqual(self.engine.snake.body.head, (x, y - 1))
+        self.engine.step()
+        self.assertEqual(self.engine.direction, DIRECTIONS["Left"])
+        self.assertEqual(self.engine.snake.body.head, (x - 1, y - 1))
+
+    def test_reversal_is_dropped(self):
+        self.press("Left")
+        self.assertEqual(len(self.engine.turns), 0)
+        self.engine.step()
+        self.assertEqual(self.engine.direction, DIRECTIONS["Right"])
+
+    def test_repeats_are_dropped(self):
+        self.press("Right")
+        self.assertEqual(len(self.engine.turns), 0)
+        self.press("Up", "Up")
+        self.assertEqual(list(self.engine.turns), [DIRECTIONS["Up"]])
+
+    def test_presses_beyond_queue_size_are_dropped(self):
+        self.press("Up", "Left", "Down", "Right")
+        self.assertEqual(len(self.engine.turns), TURN_QUEUE_SIZE)
+        self.assertEqual(list(self.engine.turns), [DIRECTIONS[name] for name in ("Up", "Left", "Down")])
+        for name in ("Up", "Left", "Down", "Down"):
+            self.engine.step()
+            self.assertEqual(self.engine.direction, DIRECTIONS[name])
+
+
+class KeyboardControllerTest(unittest.TestCase):
+    def test_turn_after_applied_turn_is_kept(self):
+        controller = KeyboardController()
+        arena = ArenaEngine(20, 20, [controller], food=0, seed=0)
+        arena.snakes[0].direction = DIRECTIONS["Right"]
+        for name in ("Right", "Up", "Left"):
+            controller.queue_turn(DIRECTIONS[name])
+            arena.step()
+            self.assertEqual(arena.snakes[0].direction, DIRECTIONS[name])
+
+    def test_presses_within_one_tick_follow_queue_rules(self):
+        controller = KeyboardController()
+        arena = ArenaEngine(20, 20, [controller], food=0, seed=0)
+        arena.snakes[0].direction = DIRECTIONS["Right"]
+        arena.step()
+        for name in ("Left", "Up", "Up", "Left", "Down", "Right"):
+            controller.queue_turn(DIRECTIONS[name])
+        self.assertEqual(list(controller.turns), [DIRECTIONS[name] for name in ("Up", "Left", "Down")])
+        for name in ("Up", "Left", "Down", "Down"):
+            arena.step()
+            self.assertEqual(arena.snakes[0].direction, DIRECTIONS[name])
+
+
+def bfs_distances(width, height, source, blocked):
+    """
+    Расстояния от source поиском в ширину по координатам, без таблицы соседей.
+    """
+    distances = [UNREACHABLE] * (width * height)
+    distances[source] = 0
+    queue = deque([source])
+    while queue:
+        cell = queue.popleft()
+        x, y = cell % width, cell // width
+        for dx, dy in MOVES:
+            other = (y + dy) % height * width + (x + dx) % width
+            if distances[other] == UNREACHABLE and other not in blocked:
+                distances[other] = distances[cell] + 1
+                queue.append(other)
+    return distances
+
+
+class DistanceFieldTest(unittest.TestCase):
+    def test_block_and_unblock_match_bfs(self):
+        rng = random.Random(4)
+        width, height = 13, 8
+        blocked = set(rng.sample(range(1, width * height), 30))
+        field = DistanceField(neighbor_table(width, height), 0, bytearray(1 if cell in blocked else 0
+                                                                          for cell in range(width * height)))
+        for _ in range(3000):
+            cell = rng.randrange(1, width * height)
+            if cell in blocked:
+                blocked.discard(cell)
+                field.unblock(cell)
+            else:
+                blocked.add(cell)
+                field.block(cell)
+            self.assertEqual(list(field.distances), bfs_distances(width, height, 0, blocked))
+
+    def test_autopilot_field_matches_bfs_around_snake_and_walls(self):
+        rng = random.Random(5)
+        engine = SnakeEngine(14, 11, walls=True, seed=5)
+        engine.update_walls()
+        autopilot = Autopilot(engine)
+        new_food = 1
+        for _ in range(5000):
+            # Автопилот чаще всего ведет сам, а случайные ходы уводят змейку в стены и тело
+            action = autopilot.choose() if rng.random() < 0.7 else rng.choice(MOVES)
+            result = engine.step(action)
+            new_food += result.ate or result.done
+            if result.done:
+                engine.reset()
+                engine.update_walls()
+            autopilot.walls = {y * engine.width + x for x, y in engine.wall_cells}
+            food = engine.food.y * engine.width + engine.food.x
+            blocked = set(engine.snake.body) | engine.wall_cells
+            blocked = {y * engine.width + x for x, y in blocked}
+            self.assertEqual(list(autopilot.distance_field()),
+                             bfs_distances(engine.width, engine.height, food, blocked - {food}))
+        # Заново поле строится только для новой еды, остальные шаги его чинят
+        self.assertEqual(autopilot.rebuilds, new_food)
+
+
+class ReplayArchiveTest(unittest.TestCase):
+    def play(self, seed):
+        engine = SnakeEngine(10, 10, seed=seed)
+        record = replay.Replay(10, 10, False, seed)
+        rng = random.Random(seed)
+        while not engine.done:
+            engine.step(rng.choice(MOVES))
+            record.record(engine.direction)
+        record.finish(engine)
+        return record
+
+    def test_archive_keeps_newest_replays_within_limit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, replay.REPLAYS_FILE)
+            with mock.patch.object(replay, "MAX_ARCHIVE_BYTES", 2000):
+                for seed in range(200):
+                    self.play(seed).append_to(path)
+                    self.assertLessEqual(os.path.getsize(path), 2000)
+            seeds = [record.seed for record in replay.read_archive(path)]
+            self.assertEqual(seeds, list(range(200 - len(seeds), 200)))
+            self.assertGreater(len(seeds), 5)
+            self.assertTrue(all(replay.verify(record) for record in replay.read_archive(path)))
+
+    def test_default_archive_in_data_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            data_dir = os.path.join(directory, "data")
+            with mock.patch.dict(os.environ, {"SNAKE_DATA_DIR": data_dir}):
+                self.play(1).append_to()
+                self.assertEqual([record.seed for record in replay.read_archive()], [1])
+            self.assertTrue(os.path.isfile(os.path.join(data_dir, replay.REPLAYS_FILE)))
+
+
+class TrajectoriesTest(unittest.TestCase):
+    def test_close_with_live_view_frees_shared_memory(self):
+        from multiprocessing import shared_memory
+
+        buffers = Trajectories(100)
+        names = list(buffers.names.values())
+        rewards = buffers.view("rewards")
+        rewards[0] = 5
+        buffers.close()
+        with self.assertRaises(ValueError):
+            rewards[0]
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+
+class FakeRoot:
+    """
+    Заменяет окно Tk для планировщика: запоминает отложенный вызов, но не выполняет его.
+    """
+    def __init__(self):
+        self.pending = None
+
+    def after(self, delay, callback):
+        self.pending = callback
+        return "after#1"
+
+    def after_cancel(self, handle):
+        self.pending = None
+
+
+class FrameStatsTest(unittest.TestCase):
+    def test_catch_up_ticks_measure_jitter_from_their_deadlines(self):
+        from snake import frame_stats, scheduler
+
+        clock = [10.0]
+        engine = SnakeEngine(20, 20, seed=1, speed=100)
+        stats = frame_stats.FrameStats()
+        root = FakeRoot()
+
+        def tick():
+            stats.timed_step(engine, None, ticks.deadline)
+            stats.end_tick(engine.speed)
+
+        ticks = scheduler.TickScheduler(root, tick, lambda: engine.speed)
+        with mock.patch.object(scheduler, "monotonic", lambda: clock[0]), \
+                mock.patch.object(frame_stats, "monotonic_ns", lambda: round(clock[0] * 1_000_000_000)):
+            ticks.start()
+            root.pending()
+            # Отрисовка задержала цикл на 350 мс: планировщик догоняет три шага подряд
+            clock[0] += 0.35
+            root.pending()
+        self.assertIsNone(ticks.deadline)
+        jitters = [row[3] / 1_000_000 for row in stats.rows()]
+        self.assertEqual(len(jitters), 4)
+        for jitter, expected in zip(jitters, (0, 250, 150, 50)):
+            self.assertAlmostEqual(jitter, expected, delta=0.001)
+
+
+class ArenaTest(unittest.TestCase):
+    def place(self, arena, index, x, y, direction):
+        snake = arena.snakes[index]
+        arena.kill(snake)
+        snake.body.push_head(x, y)
+        snake.direction = direction
+        snake.alive = True
+
+    def test_head_to_head_swap_kills_both(self):
+        right, left = DIRECTIONS["Right"], DIRECTIONS["Left"]
+        arena = ArenaEngine(10, 10, [ScriptedController([right]), ScriptedController([left])], food=0, seed=0)
+        self.place(arena, 0, 3, 5, right)
+        self.place(arena, 1, 4, 5, left)
+        self.assertEqual(sorted(arena.step().died), [0, 1])
+
+    def test_following_snake_survives(self):
+        right = DIRECTIONS["Right"]
+        arena = ArenaEngine(10, 10, [ScriptedController([right]), ScriptedController([right])], food=0, seed=0)
+        self.place(arena, 0, 3, 5, right)
+        self.place(arena, 1, 4, 5, right)
+        self.assertEqual(arena.step().died, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Проверки сервера арены через настоящее подключение по TCP.
+
+Запуск: python -m unittest test_server
+"""
+import asyncio
+import unittest
+
+from snake.engine import DIRECTIONS
+from snake.protocol import CODES, ArenaMirror, read_frames
+from snake.server import ArenaServer
+
+
+async def until(condition, message, timeout=5.0):
+    """
+    Ждет, пока condition() не станет истинным, отдавая управление циклу событий.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            raise AssertionError(message)
+        await asyncio.sleep(0.001)
+
+
+class ServerTurnTest(unittest.TestCase):
+    def test_turns_sent_across_ticks_are_applied(self):
+        asyncio.run(self.play_turns())
+
+    async def play_turns(self):
+        server = ArenaServer(20, 20, food=0, seed=0)
+        server.server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = server.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await until(lambda: server.joining, "клиент не подключился")
+            client = server.joining[0]
+            server.step()
+            snake = server.engine.snakes[client.index]
+            # Змейка появляется со случайным направлением; для проверки она едет вниз
+            snake.direction = DIRECTIONS["Down"]
+            client.controller.direction = snake.direction
+
+            mirror = ArenaMirror()
+            buffer = bytearray()
+            heads = []
+            for name in ("Right", "Up", "Left"):
+                writer.write(bytes([CODES[DIRECTIONS[name]]]))
+                await writer.drain()
+                await until(lambda: client.controller.turns, f"поворот {name} не попал в очередь")
+                server.step()
+                self.assertEqual(snake.direction, DIRECTIONS[name])
+                frames = []
+                while len(frames) < (2 if name == "Right" else 1):
+                    buffer += await asyncio.wait_for(reader.read(65536), 5.0)
+                    frames += read_frames(buffer)
+                for payload in frames:
+                    if payload[:1] == b"S":
+                        mirror.load_snapshot(payload)
+                    else:
+                        mirror.decode_delta(payload)
+                heads.append(mirror.xy(mirror.bodies[mirror.you][0]))
+
+            # Клиент видит те же повороты: вверх и затем влево
+            (x1, y1), (x2, y2), (x3, y3) = heads
+            self.assertEqual(((x2 - x1) % 20, (y2 - y1) % 20), (0, 19))
+            self.assertEqual(((x3 - x2) % 20, (y3 - y2) % 20), (19, 0))
+        finally:
+            writer.close()
+            await writer.wait_closed()
+            # Обработчик клиента должен заметить отключение до остановки цикла событий
+            await until(lambda: not server.clients and not server.joining, "сервер не заметил отключение")
+            server.stop()
+            await server.server.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Проверки интерфейса игры на заглушке tkinter (tkstub.py), без дисплея.
+
+Запуск: python -m unittest test_ui
+С настоящим Tk те же замеры выполняет bench.py (xvfb-run python bench.py soak startup).
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import bench
+import snake.game
+import snake.highscores
+import snake.replay
+import snake.overlays
+import snake.sprites
+import tkstub
+from snake.paths import DATA_DIR_VARIABLE
+
+
+def stub_tk():
+    """
+    Подменяет tkinter заглушкой в модулях игры, которые создают виджеты и картинки.
+    """
+    patches = [mock.patch.object(module, "tk", tkstub) for module in (snake.game, snake.overlays, snake.sprites)]
+    patches.append(mock.patch.dict(snake.sprites.CACHE))
+    return patches
+
+
+class SoakTest(unittest.TestCase):
+    def setUp(self):
+        for patch in stub_tk():
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_widgets_items_images_and_memory_stay_flat(self):
+        result = bench.bench_soak(cycles=1000, warmup=100)
+        self.assertEqual(result["widgets"][0], result["widgets"][1])
+        self.assertEqual(result["canvas_items"][0], result["canvas_items"][1])
+        self.assertEqual(result["images"][0], result["images"][1])
+        if result["rss_growth_mb"] is not None:
+            self.assertLessEqual(result["rss_growth_mb"], bench.SOAK_RSS_BUDGET_MB)
+        self.assertTrue(result["within_budget"])
+
+
+class DataErrorTest(unittest.TestCase):
+    """
+    Игра заканчивается как обычно, даже если рекорды и запись игры некуда записать.
+    """
+    def setUp(self):
+        for patch in stub_tk():
+            patch.start()
+            self.addCleanup(patch.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def finish_game(self, data_dir, scores):
+        with mock.patch.dict(os.environ, {DATA_DIR_VARIABLE: data_dir}):
+            game = snake.game.Game(20, 20)
+            self.addCleanup(game.root.destroy)
+            self.addCleanup(game.high_scores.close)
+            game.start_game()
+            game.play()
+            game.scheduler.stop()
+            items = len(game.canvas.find_all())
+            game.game_over()
+            # Надпись об окончании игры появилась, значит game_over дошел до конца
+            self.assertEqual(len(game.canvas.find_all()), items + 1)
+            game.high_scores_window.show()
+            self.assertEqual(game.high_scores_window.listbox.items, scores)
+
+    def test_database_cannot_be_opened(self):
+        os.mkdir(os.path.join(self.directory, snake.highscores.HIGH_SCORES_FILE))
+        self.finish_game(self.directory, [])
+
+    def test_replay_archive_cannot_be_written(self):
+        os.mkdir(os.path.join(self.directory, snake.replay.REPLAYS_FILE))
+        self.finish_game(self.directory, ["1. 0"])
+
+    def test_data_dir_cannot_be_created(self):
+        path = os.path.join(self.directory, "file")
+        open(path, "w").close()
+        self.finish_game(os.path.join(path, "snake"), [])
+
+
+class StartupTest(unittest.TestCase):
+    def test_import_within_budget(self):
+        result = bench.bench_import(repeat=3)
+        for module, ms in result["import_ms"].items():
+            self.assertLessEqual(ms, bench.IMPORT_BUDGET_MS, module)
+
+    def test_first_frame_within_budget(self):
+        # Холодный запуск в отдельном процессе: tkinter подменяется заглушкой до импорта игры
+        command = [sys.executable, "-c", "import sys, tkstub; sys.modules['tkinter'] = tkstub; "
+                                         "from snake.__main__ import main; main(['--startup-benchmark'])"]
+        self.assertLessEqual(bench.run_best(command, 3), bench.FIRST_FRAME_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Заглушка tkinter для проверок интерфейса без дисплея.
+
+Повторяет ту часть tkinter, которой пользуется игра: окна и виджеты с
+деревом дочерних виджетов, холст с элементами и тегами, картинки и
+отложенные вызовы. Ничего не рисует, но считает виджеты, элементы холста
+и картинки так же, как их считал бы Tk, поэтому на ней видны утечки.
+
+Модуль подменяет tkinter целиком (sys.modules["tkinter"] = tkstub) или
+только в нужных модулях игры (unittest.mock.patch.object(snake.game, "tk", tkstub)).
+"""
+import itertools
+
+END = "end"
+
+
+class TclError(Exception):
+    pass
+
+
+class Interpreter:
+    """
+    Общее состояние одного окна Tk: отложенные вызовы и имена картинок.
+    """
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.timers = {}
+        self.idle = []
+        self.images = []
+
+
+class Widget:
+    # Методы размещения и настройки, которые заглушке незачем выполнять
+    NO_OPS = {"pack", "place", "place_forget", "config", "configure", "title", "resizable", "protocol", "bind",
+              "withdraw", "deiconify", "lift"}
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.tk = master.tk if master is not None else Interpreter()
+        self.children = []
+        self.destroyed = False
+        if master is not None:
+            master.children.append(self)
+
+    def __getattr__(self, name):
+        if name in Widget.NO_OPS:
+            return lambda *args, **options: None
+        raise AttributeError(name)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def image_names(self):
+        return tuple(self.tk.images)
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def destroy(self):
+        for child in list(self.children):
+            child.destroy()
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+        self.destroyed = True
+
+    def after(self, ms, func, *args):
+        handle = f"after#{next(self.tk.ids)}"
+        self.tk.timers[handle] = (func, args)
+        return handle
+
+    def after_idle(self, func, *args):
+        self.tk.idle.append((func, args))
+
+    def after_cancel(self, handle):
+        self.tk.timers.pop(handle, None)
+
+    def update(self):
+        """
+        Выполняет накопившиеся вызовы after_idle.
+        """
+        idle, self.tk.idle = self.tk.idle, []
+        for func, args in idle:
+            func(*args)
+
+    def mainloop(self):
+        """
+        Выполняет отложенные вызовы по очереди, не дожидаясь их времени, пока окно не закроют.
+        """
+        while not self.destroyed and (self.tk.idle or self.tk.timers):
+            if self.tk.idle:
+                self.update()
+            else:
+                handle = next(iter(self.tk.timers))
+                func, args = self.tk.timers.pop(handle)
+                func(*args)
+
+
+class Tk(Widget):
+    pass
+
+
+class Toplevel(Widget):
+    pass
+
+
+class Label(Widget):
+    pass
+
+
+class Button(Widget):
+    pass
+
+
+class Listbox(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = []
+
+    def delete(self, first, last=None):
+        del self.items[first:None if last == END else (first + 1 if last is None else last + 1)]
+
+    def insert(self, index, *elements):
+        position = len(self.items) if index == END else index
+        self.items[position:position] = elements
+
+
+class Canvas(Widget):
+    """
+    Холст, который хранит только номера элементов и их теги.
+    """
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.ids = itertools.count(1)
+        self.items = {}
+
+    def create(self, *coords, tags=(), **options):
+        item = next(self.ids)
+        self.items[item] = {tags} if isinstance(tags, str) else set(tags) - {None}
+        return item
+
+    create_line = create_oval = create_rectangle = create_image = create_text = create
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def delete(self, *tags_or_ids):
+        for tag in tags_or_ids:
+            if tag == "all":
+                self.items.clear()
+            elif isinstance(tag, int):
+                self.items.pop(tag, None)
+            else:
+                for item in [item for item, tags in self.items.items() if tag in tags]:
+                    del self.items[item]
+
+    def check(self, item):
+        if isinstance(item, int) and item not in self.items:
+            raise TclError(f"элемента холста {item} нет")
+
+    def coords(self, item, *coords):
+        self.check(item)
+
+    def itemconfig(self, item, **options):
+        self.check(item)
+
+    def move(self, tag, dx, dy):
+        pass
+
+    def xview_moveto(self, fraction):
+        pass
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+class PhotoImage:
+    def __init__(self, master=None, width=0, height=0, **options):
+        self.tk = master.tk
+        self.name = f"pyimage{len(self.tk.images) + 1}"
+        self.tk.images.append(self.name)
+
+    def put(self, data, to=None):
+        pass